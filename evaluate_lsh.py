@@ -0,0 +1,83 @@
+"""
+Module Description
+==================
+This module is an evaluation script for the MovieLSH index. For several (bands, rows) settings it measures,
+against a brute force scan over every movie in imdb_top_1000.csv:
+- recall: the fraction of truly similar pairs (exact Jaccard >= threshold) that the index returns
+- the average number of candidates the index has to score per query
+- the average query time of the index and of brute force
+
+Run it with: python evaluate_lsh.py [movie_file] [threshold]
+
+Copyright and Usage Information
+===============================
+
+This file is solely for the personal and private use of
+Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited.
+
+This file is Copyright (c) 2025 Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang
+"""
+import sys
+import time
+from movie_data import MovieData
+from movie_actor_graph import load_movie_actor_graph
+from movie_lsh import MovieLSH, movie_tokens, brute_force_similar
+
+# (bands, rows) settings to compare, from highest recall to lowest latency
+SETTINGS = [(64, 2), (32, 3), (32, 4), (16, 4), (16, 8)]
+
+
+def evaluate(tokens: dict[str, set[str]], bands: int, rows: int, threshold: float,
+             truth: dict[str, set[str]]) -> dict[str, float]:
+    """Return the recall, average candidate count and average query time of a MovieLSH index with the
+    given banding parameters, measured against the given brute force results.
+    """
+    start = time.perf_counter()
+    lsh = MovieLSH(bands, rows)
+    lsh.build(tokens)
+    build_time = time.perf_counter() - start
+
+    found = 0
+    expected = 0
+    candidate_count = 0
+    start = time.perf_counter()
+    for title in tokens:
+        result = {other for other, _ in lsh.similar(title, k=len(tokens), threshold=threshold)}
+        candidate_count += len(lsh.candidates(title))
+        found += len(result & truth[title])
+        expected += len(truth[title])
+    query_time = (time.perf_counter() - start) / len(tokens)
+
+    return {'recall': found / expected if expected else 1.0,
+            'candidates': candidate_count / len(tokens),
+            'build_ms': build_time * 1000,
+            'query_ms': query_time * 1000}
+
+
+def main(movie_file: str = 'imdb_top_1000.csv', threshold: float = 0.3) -> None:
+    """Print the evaluation table for every setting in SETTINGS on the given dataset."""
+    graph = load_movie_actor_graph(movie_file)
+    tokens = movie_tokens(graph, MovieData.load_movie_basics(movie_file))
+
+    start = time.perf_counter()
+    truth = {title: brute_force_similar(tokens, title, threshold) for title in tokens}
+    brute_ms = (time.perf_counter() - start) / len(tokens) * 1000
+
+    print(f'{len(tokens)} movies, threshold {threshold}, '
+          f'{sum(len(v) for v in truth.values()) // 2} similar pairs, brute force {brute_ms:.3f} ms/query')
+    print(f'{"bands":>6} {"rows":>5} {"recall":>8} {"candidates":>11} {"build ms":>9} {"query ms":>9}')
+    for bands, rows in SETTINGS:
+        result = evaluate(tokens, bands, rows, threshold, truth)
+        print(f'{bands:>6} {rows:>5} {result["recall"]:>8.3f} {result["candidates"]:>11.1f} '
+              f'{result["build_ms"]:>9.1f} {result["query_ms"]:>9.3f}')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2:
+        main(sys.argv[1], float(sys.argv[2]))
+    elif len(sys.argv) > 1:
+        main(sys.argv[1])
+    else:
+        main()
@@ -0,0 +1,67 @@
+"""
+Module Description
+==================
+This module is an evaluation script comparing the split orders of build_decision_tree. For each criterion
+accepted by split_order it reports:
+- the number of nodes in the tree
+- the time taken to build the tree
+- the average number of levels traverse_tree descends, over every query the preference screen can produce
+  with one runtime bin and up to two genres, and how many of those queries have an exact match
+
+Run it with: python evaluate_tree.py [decision_file]
+
+Copyright and Usage Information
+===============================
+
+This file is solely for the personal and private use of
+Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited.
+
+This file is Copyright (c) 2025 Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang
+"""
+import csv
+import sys
+import time
+from itertools import combinations
+from recommender import build_decision_tree, convert_user_input
+
+CRITERIA = ['csv', 'entropy', 'gain']
+
+
+def preference_queries(decision_file: str) -> list[set[str]]:
+    """Return every query with one runtime bin and up to two genres, in terms of decision csv columns."""
+    with open(decision_file) as csv_file:
+        header = next(csv.reader(csv_file))
+    runtimes = [col for col in header if col.startswith('runtime_bin_')]
+    genres = [col for col in header if col.startswith('genre_')]
+    genre_sets = [set()] + [{g} for g in genres] + [set(pair) for pair in combinations(genres, 2)]
+    return [{runtime} | genre_set for runtime in runtimes for genre_set in genre_sets]
+
+
+def main(decision_file: str = 'decision_tree.csv') -> None:
+    """Print the node count, build time and average traversal depth of the tree for each criterion."""
+    queries = preference_queries(decision_file)
+    print(f'{len(queries)} queries')
+    print(f'{"criterion":>10} {"nodes":>7} {"build ms":>9} {"avg depth":>10} {"found":>6}')
+    for criterion in CRITERIA:
+        start = time.perf_counter()
+        tree = build_decision_tree(decision_file, criterion)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        total_depth = 0
+        found = 0
+        for query in queries:
+            encoded = convert_user_input(query, decision_file)
+            total_depth += tree.traversal_depth(encoded)
+            if tree.traverse_tree(encoded) != 'Not Found':
+                found += 1
+        print(f'{criterion:>10} {tree.size():>7} {build_ms:>9.1f} '
+              f'{total_depth / len(queries):>10.2f} {found:>6}')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(sys.argv[1])
+    else:
+        main()
@@ -0,0 +1,288 @@
+"""
+Module Description
+==================
+This module contains the MovieIndex and IndexHandle classes, which let many threads query the movie data
+structures while a new version of them is built and published in the background.
+
+A MovieIndex is one immutable version of everything a query needs: the movie graph, the decision tree, the
+packed signature index and the decision csv header used to encode preferences. It cannot be changed after
+it is built, so any number of threads can read it without locks.
+
+An IndexHandle holds the current MovieIndex. Query threads take the current version with acquire() (or the
+reader() context manager) and keep using it until they are done, even if a newer version is published in the
+meantime. Publishing a new version is a single reference swap. A replaced version is kept alive until its
+last reader releases it, and is then closed so that its memory can be reclaimed.
+
+A QueryCache keeps recent search results keyed by index version, so cached results are never mixed across
+versions.
+
+Copyright and Usage Information
+===============================
+
+This file is solely for the personal and private use of
+Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited.
+
+This file is Copyright (c) 2025 Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang
+"""
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+import numpy as np
+from tree import MovieDecisionTree, MovieSignatureIndex, encode_batch
+
+
+class MovieIndex:
+    """One immutable version of the data structures used to answer queries.
+
+    Instance Attributes:
+        - version: the version number of this index, increasing with every reload
+        - graph: the movie graph used for actor searches
+        - tree: the decision tree used for genre and runtime searches, or None if it was left out to fit a
+          memory budget
+        - signatures: the packed signature index used when the tree has no exact match
+        - feature_names: the decision csv columns, in the order the signatures use
+        - vocabulary: maps each decision csv column to its position in feature_names
+        - closed: whether this index has been released by its IndexHandle
+
+    Representation Invariants:
+        - self.closed or len(self.feature_names) == self.signatures.num_features
+    """
+    version: int
+    graph: Any
+    tree: Optional[MovieDecisionTree]
+    signatures: MovieSignatureIndex
+    feature_names: list[str]
+    vocabulary: dict[str, int]
+    closed: bool
+
+    def __init__(self, version: int, graph: Any, tree: Optional[MovieDecisionTree], signatures: MovieSignatureIndex,
+                 feature_names: list[str]) -> None:
+        """Initialize the index. Its attributes cannot be changed afterwards."""
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, 'graph', graph)
+        object.__setattr__(self, 'tree', tree)
+        object.__setattr__(self, 'signatures', signatures)
+        object.__setattr__(self, 'feature_names', feature_names)
+        object.__setattr__(self, 'vocabulary', {name: i for i, name in enumerate(feature_names)})
+        object.__setattr__(self, 'closed', False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Raise an AttributeError: a MovieIndex is immutable."""
+        raise AttributeError('MovieIndex is immutable')
+
+    def encode(self, columns: set[str]) -> list[int]:
+        """Return the binary encoding of the given decision csv columns, like convert_user_input, using the
+        header stored in this index instead of reading the decision csv.
+        """
+        return [1 if name in columns else 0 for name in self.feature_names]
+
+    def encode_batch(self, column_sets: list[set[str]]) -> np.ndarray:
+        """Return the binary encodings of many sets of decision csv columns at once, as the rows of an
+        N x F matrix, with each row equal to encode(columns).
+        """
+        return encode_batch(self.vocabulary, column_sets)
+
+    def close(self) -> None:
+        """Drop the references to this index's data structures so their memory can be reclaimed.
+        Only the IndexHandle that published this index calls this, once no reader is using it.
+        """
+        for name in ('graph', 'tree', 'signatures'):
+            object.__setattr__(self, name, None)
+        object.__setattr__(self, 'closed', True)
+
+
+class IndexHandle:
+    """A thread-safe reference to the current MovieIndex, which can be replaced while it is being read.
+
+    Instance Attributes:
+        - released: the versions that have been replaced and closed, in the order they were closed
+
+    Representation Invariants:
+        - all(self._readers[v] > 0 for v in self._retired)
+    """
+    released: list[int]
+    # Private Instance Attributes:
+    #     - _current: the index new readers get
+    #     - _lock: protects _readers, _retired and the swap of _current
+    #     - _reload_lock: makes reloads run one at a time, so versions are published in order
+    #     - _readers: maps each version to the number of readers currently using it
+    #     - _retired: maps each replaced version that still has readers to its index
+    #     - _next_version: the version number the next reload builds
+    _current: MovieIndex
+    _lock: threading.Lock
+    _reload_lock: threading.Lock
+    _readers: dict[int, int]
+    _retired: dict[int, MovieIndex]
+    _next_version: int
+
+    def __init__(self, index: MovieIndex) -> None:
+        """Initialize the handle with the given index as its current version."""
+        self._current = index
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._readers = {}
+        self._retired = {}
+        self._next_version = index.version + 1
+        self.released = []
+
+    def current(self) -> MovieIndex:
+        """Return the current index without registering as a reader. The index may be closed once it is
+        replaced, so use acquire or reader for anything longer than a single attribute read.
+        """
+        return self._current
+
+    def acquire(self) -> MovieIndex:
+        """Return the current index and register as one of its readers. Every call must be matched by a call
+        to release with the returned index.
+        """
+        with self._lock:
+            index = self._current
+            self._readers[index.version] = self._readers.get(index.version, 0) + 1
+            return index
+
+    def release(self, index: MovieIndex) -> None:
+        """Unregister a reader of the given index. If it was the last reader of a replaced index, close it."""
+        with self._lock:
+            self._readers[index.version] -= 1
+            if self._readers[index.version] > 0:
+                return
+            del self._readers[index.version]
+            retired = self._retired.pop(index.version, None)
+        if retired is not None:
+            retired.close()
+            self.released.append(retired.version)
+
+    @contextmanager
+    def reader(self) -> Iterator[MovieIndex]:
+        """Return a context manager that acquires the current index and releases it on exit.
+
+        >>> handle = IndexHandle(MovieIndex(0, None, MovieDecisionTree('', []), MovieSignatureIndex([], []), []))
+        >>> with handle.reader() as index:
+        ...     index.version
+        0
+        """
+        index = self.acquire()
+        try:
+            yield index
+        finally:
+            self.release(index)
+
+    def publish(self, index: MovieIndex) -> None:
+        """Make the given index the current version. Readers already using the old version keep it until they
+        release it; if it has no readers it is closed straight away.
+        """
+        with self._lock:
+            old = self._current
+            self._current = index
+            if self._readers.get(old.version, 0) > 0:
+                self._retired[old.version] = old
+                old = None
+        if old is not None:
+            old.close()
+            self.released.append(old.version)
+
+    def reload(self, build: Callable[[int], MovieIndex]) -> MovieIndex:
+        """Build a new index with build(version) and publish it, without blocking readers while it is built.
+        Return the new index.
+        """
+        with self._reload_lock:
+            version = self._next_version
+            self._next_version += 1
+            index = build(version)
+            self.publish(index)
+            return index
+
+    def reload_async(self, build: Callable[[int], MovieIndex]) -> threading.Thread:
+        """Start reloading with build in a background thread and return the thread."""
+        thread = threading.Thread(target=self.reload, args=(build,), daemon=True)
+        thread.start()
+        return thread
+
+    def pending(self) -> list[int]:
+        """Return the replaced versions that are still waiting for their readers to finish."""
+        with self._lock:
+            return sorted(self._retired)
+
+
+class QueryCache:
+    """A thread-safe least-recently-used cache of search results, keyed by index version and query, so a
+    reload never serves results from an older version.
+
+    Instance Attributes:
+        - capacity: the most results kept at once; 0 disables the cache
+        - hits: the number of lookups answered from the cache
+        - misses: the number of lookups that had to run the search
+
+    Representation Invariants:
+        - len(self._results) <= self.capacity
+    """
+    capacity: int
+    hits: int
+    misses: int
+    # Private Instance Attributes:
+    #     - _results: maps each (version, query) key to its result, least recently used first
+    #     - _lock: protects _results and the counters
+    _results: OrderedDict[tuple, Any]
+    _lock: threading.Lock
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty cache holding at most capacity results."""
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, index: MovieIndex, query: tuple, compute: Callable[[], Any]) -> Any:
+        """Return the cached result of query on the given index, or compute() it and cache it.
+        The query must be hashable.
+
+        >>> cache = QueryCache(1)
+        >>> index = MovieIndex(0, None, MovieDecisionTree('', []), MovieSignatureIndex([], []), [])
+        >>> cache.get_or_compute(index, ('actor', 'Al Pacino'), lambda: 13)
+        13
+        >>> cache.get_or_compute(index, ('actor', 'Al Pacino'), lambda: 0)
+        13
+        >>> cache.hit_rate()
+        0.5
+        """
+        key = (index.version, query)
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return self._results[key]
+            self.misses += 1
+        result = compute()
+        if self.capacity > 0:
+            with self._lock:
+                self._results[key] = result
+                self._results.move_to_end(key)
+                while len(self._results) > self.capacity:
+                    self._results.popitem(last=False)
+        return result
+
+    def hit_rate(self) -> float:
+        """Return the fraction of lookups answered from the cache, or 0.0 if there were none."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+if __name__ == '__main__':
+
+    import python_ta.contracts
+    import doctest
+
+    python_ta.contracts.check_all_contracts()
+
+    doctest.testmod(verbose='TRUE')
+
+    python_ta.check_all(config={
+        'extra-imports': ['__future__', 'threading', 'collections', 'contextlib', 'typing', 'numpy', 'tree'],
+        'allowed-io': [],     # the names (strs) of functions that call print/open/input
+        'max-line-length': 120
+    })
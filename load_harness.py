@@ -0,0 +1,227 @@
+"""
+Module Description
+==================
+This module is a load harness that replays user session traces against the headless search engine (the
+search_actor and recommend_movies helpers behind the Recommender screens), without opening any window.
+
+A session trace is a list of sessions; each session is a list of steps, and each step is either an actor
+search or a runtime/genre preference search, with the think time (in seconds) the user waited before it.
+Traces are saved as JSON, one session per line. They can be synthesized from the dataset with
+synthesize_sessions, or recorded from real use: run main.py with the CINEMATCH_TRACE environment variable set
+to a trace file, and the searches of that run are appended to it as one session when the window is closed.
+
+Each scenario replays the trace with its own configuration (number of concurrent sessions, think time scale,
+result cache size and decision tree split order) in a fresh process, and reports the p50/p95/p99 search
+latency, the throughput, the cache hit rate and the peak resident set size of that process.
+
+Run it with: python load_harness.py [trace_file]
+If trace_file does not exist, a synthetic trace is written to it first.
+
+Copyright and Usage Information
+===============================
+
+This file is solely for the personal and private use of
+Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited.
+
+This file is Copyright (c) 2025 Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang
+"""
+import json
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from typing import Any
+import numpy as np
+from live_index import IndexHandle, QueryCache
+from movie_actor_graph import load_movie_actor_graph
+from recommender import LENGTH_MAP, GENRE_MAP, build_movie_index, search_actor, recommend_movies
+
+MOVIE_FILE = 'imdb_top_1000.csv'
+
+# The configurations compared by main: each replays the same trace
+SCENARIOS = [
+    {'name': 'baseline', 'concurrency': 8, 'think_scale': 0.0, 'cache_size': 0, 'criterion': 'csv'},
+    {'name': 'gain-tree', 'concurrency': 8, 'think_scale': 0.0, 'cache_size': 0, 'criterion': 'gain'},
+    {'name': 'gain-cached', 'concurrency': 8, 'think_scale': 0.0, 'cache_size': 1024, 'criterion': 'gain'},
+    {'name': 'think-time', 'concurrency': 32, 'think_scale': 0.01, 'cache_size': 1024, 'criterion': 'gain'},
+]
+
+
+class TraceRecorder:
+    """Records the searches made through a Recommender as one session of a trace.
+
+    Instance Attributes:
+        - sessions: the recorded sessions (a single session, the current one)
+    """
+    sessions: list[list[dict[str, Any]]]
+    # Private Instance Attributes:
+    #     - _last: the time of the previous recorded step, used to compute think times
+    _last: float
+
+    def __init__(self) -> None:
+        """Initialize the recorder with one empty session."""
+        self.sessions = [[]]
+        self._last = time.perf_counter()
+
+    def _record(self, step: dict[str, Any]) -> None:
+        """Append the given step to the current session, with the time since the previous step."""
+        now = time.perf_counter()
+        step['think'] = round(now - self._last, 3)
+        self._last = now
+        self.sessions[-1].append(step)
+
+    def record_actor(self, actor: str) -> None:
+        """Record an actor search."""
+        self._record({'op': 'actor', 'actor': actor})
+
+    def record_preferences(self, length: str, genres: list[str]) -> None:
+        """Record a runtime/genre preference search."""
+        self._record({'op': 'preferences', 'length': length, 'genres': list(genres)})
+
+    def save(self, trace_file: str) -> None:
+        """Append the recorded sessions that made at least one search to trace_file."""
+        save_trace([session for session in self.sessions if session], trace_file, append=True)
+
+
+def synthesize_sessions(num_sessions: int, movie_file: str = MOVIE_FILE, seed: int = 111) -> list[list[dict]]:
+    """Return num_sessions synthetic sessions. Each session makes 2 to 8 searches with exponentially distributed
+    think times (mean 3 seconds). About a third are actor searches, skewed towards actors with many movies and
+    with 1 in 10 names not in the dataset; the rest are preference searches with one runtime and 1 to 3 genres.
+    """
+    rng = random.Random(seed)
+    graph = load_movie_actor_graph(movie_file)
+    actors = sorted(graph.get_vertices('actor'))
+    weights = [len(graph.get_neighbours(actor, 'movie', 'actor')) ** 2 for actor in actors]
+    lengths = list(LENGTH_MAP)
+    genres = list(GENRE_MAP)
+
+    sessions = []
+    for _ in range(num_sessions):
+        session = []
+        for _ in range(rng.randint(2, 8)):
+            think = round(rng.expovariate(1 / 3.0), 3)
+            if rng.random() < 1 / 3:
+                actor = rng.choices(actors, weights)[0] if rng.random() < 0.9 else f'Unknown Actor {rng.randint(1, 99)}'
+                session.append({'op': 'actor', 'actor': actor, 'think': think})
+            else:
+                session.append({'op': 'preferences', 'length': rng.choice(lengths),
+                                'genres': rng.sample(genres, rng.randint(1, 3)), 'think': think})
+        sessions.append(session)
+    return sessions
+
+
+def save_trace(sessions: list[list[dict]], trace_file: str, append: bool = False) -> None:
+    """Write the given sessions to trace_file, one JSON session per line, after its existing sessions if append
+    is True.
+    """
+    with open(trace_file, 'a' if append else 'w', encoding='utf-8') as f:
+        for session in sessions:
+            f.write(json.dumps(session) + '\n')
+
+
+def load_trace(trace_file: str) -> list[list[dict]]:
+    """Return the sessions in the given trace file."""
+    with open(trace_file, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def run_step(handle: IndexHandle, cache: QueryCache, step: dict[str, Any]) -> None:
+    """Run the search of one session step against the current index, through the cache."""
+    with handle.reader() as index:
+        if step['op'] == 'actor':
+            cache.get_or_compute(index, ('actor', step['actor']), lambda: search_actor(index, step['actor']))
+        else:
+            query = ('preferences', step['length'], tuple(sorted(step['genres'])))
+            cache.get_or_compute(index, query, lambda: recommend_movies(index, step['length'], step['genres']))
+
+
+def replay(handle: IndexHandle, sessions: list[list[dict]], concurrency: int, think_scale: float,
+           cache: QueryCache) -> tuple[list[float], float]:
+    """Replay the sessions with concurrency threads, each taking the next unplayed session when it finishes
+    one. Think times are multiplied by think_scale. Return the latency of every step in seconds, and the wall
+    clock time of the whole replay.
+    """
+    latencies = []
+    lock = threading.Lock()
+    remaining = list(reversed(sessions))
+
+    def worker() -> None:
+        """Replay sessions until none are left."""
+        while True:
+            with lock:
+                if not remaining:
+                    return
+                session = remaining.pop()
+            for step in session:
+                if think_scale > 0:
+                    time.sleep(step['think'] * think_scale)
+                start = time.perf_counter()
+                run_step(handle, cache, step)
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, time.perf_counter() - start
+
+
+def run_scenario(scenario: dict[str, Any], trace_file: str) -> dict[str, Any]:
+    """Build the index with the scenario's split order, replay the trace with its configuration and return
+    its report. Meant to run in a fresh process so that the peak RSS belongs to this scenario alone.
+    """
+    decision_file = os.path.join(tempfile.mkdtemp(), 'decision_tree.csv')
+    handle = IndexHandle(build_movie_index(MOVIE_FILE, decision_file, criterion=scenario['criterion']))
+    cache = QueryCache(scenario['cache_size'])
+    latencies, wall = replay(handle, load_trace(trace_file), scenario['concurrency'], scenario['think_scale'],
+                             cache)
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+    return {'name': scenario['name'], 'steps': len(latencies), 'p50_ms': float(p50), 'p95_ms': float(p95),
+            'p99_ms': float(p99), 'throughput': len(latencies) / wall, 'hit_rate': cache.hit_rate(),
+            # ru_maxrss is in kilobytes on Linux
+            'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+
+
+def _scenario_process(scenario: dict[str, Any], trace_file: str, results: Any) -> None:
+    """Run one scenario and put its report on the results queue."""
+    results.put(run_scenario(scenario, trace_file))
+
+
+def main(trace_file: str = 'session_trace.jsonl', num_sessions: int = 500) -> None:
+    """Replay the trace in trace_file (synthesizing it first if it does not exist) under every scenario in
+    SCENARIOS, each in its own process, and print a report line per scenario.
+    """
+    if not os.path.exists(trace_file):
+        save_trace(synthesize_sessions(num_sessions), trace_file)
+    sessions = load_trace(trace_file)
+    print(f'{len(sessions)} sessions, {sum(len(s) for s in sessions)} steps from {trace_file}')
+    print(f'{"scenario":>12} {"steps":>6} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"ops/s":>9} '
+          f'{"hit rate":>9} {"peak MB":>8}')
+
+    context = multiprocessing.get_context('spawn')
+    for scenario in SCENARIOS:
+        results = context.Queue()
+        process = context.Process(target=_scenario_process, args=(scenario, trace_file, results))
+        process.start()
+        report = results.get()
+        process.join()
+        print(f'{report["name"]:>12} {report["steps"]:>6} {report["p50_ms"]:>8.3f} {report["p95_ms"]:>8.3f} '
+              f'{report["p99_ms"]:>8.3f} {report["throughput"]:>9.1f} {report["hit_rate"]:>9.2f} '
+              f'{report["peak_rss_mb"]:>8.1f}')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(sys.argv[1])
+    else:
+        main()
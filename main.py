@@ -17,6 +17,7 @@ expressly prohibited.
 
 This file is Copyright (c) 2025 Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang
 """
+import os
 import tkinter as tk
 from tkinter import ttk
 from recommender import Recommender
@@ -26,7 +27,7 @@ if __name__ == "__main__":
     import python_ta
     python_ta.check_all(config={
         'max-line-length': 120,
-        'extra-imports': ['tkinter', 'recommender'],
+        'extra-imports': ['os', 'tkinter', 'recommender', 'load_harness'],
         'max-nested-blocks': 4
     })
 
@@ -38,6 +39,17 @@ if __name__ == "__main__":
     style.configure('Secondary.TButton', font=('Arial', 14), foreground='white', background='#FF6B6B')
 
     # Initialize and run recommender
+    # set CINEMATCH_TRACE to a file to record this run's searches as a session for load_harness.py
+    trace_file = os.environ.get('CINEMATCH_TRACE')
+    recorder = None
+    if trace_file:
+        # only imported when recording, since the harness needs modules (such as resource) that the app does not
+        from load_harness import TraceRecorder
+        recorder = TraceRecorder()
+
     root1 = tk.Tk()
-    app = Recommender(root1)
+    app = Recommender(root1, recorder)
     root1.mainloop()
+
+    if recorder is not None:
+        recorder.save(trace_file)
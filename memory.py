@@ -0,0 +1,170 @@
+"""
+Module Description
+==================
+This module contains the memory accounting helpers shared by the Graph, MovieDecisionTree and MovieData
+structures:
+- deep_size_report walks everything reachable from an object and breaks its size down into objects,
+  containers, strings and arrays
+- profile_build runs a build function under tracemalloc and reports its peak allocation and top allocation sites
+- check_budget compares an estimated build size against a memory budget, so callers can refuse the build or
+  downgrade to a compact backend before allocating anything
+
+Copyright and Usage Information
+===============================
+
+This file is solely for the personal and private use of
+Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited.
+
+This file is Copyright (c) 2025 Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang
+"""
+from __future__ import annotations
+import sys
+import time
+import tracemalloc
+import types
+from typing import Any, Callable
+import numpy as np
+
+# Types whose instances are counted as containers rather than objects
+CONTAINER_TYPES = (dict, list, tuple, set, frozenset)
+# Types whose instances are counted as strings
+STRING_TYPES = (str, bytes, bytearray)
+# Types whose instances are shared program state rather than data, so they are not followed
+SKIPPED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def deep_size_report(root: Any) -> dict[str, int]:
+    """Return a breakdown of the bytes used by root and everything reachable from it.
+
+    The report maps each category to its size in bytes, and counts to the number of values in it:
+    - 'objects': instances of classes (their header and attribute dictionary), and numbers
+    - 'containers': dicts, lists, tuples and sets (their own storage, not their contents)
+    - 'strings': str and bytes values
+    - 'arrays': numpy arrays (their header plus the data they own)
+    - 'total': the sum of the above
+    Every value is counted once, however many times it is referenced. Classes, functions and modules are not
+    followed.
+
+    >>> report = deep_size_report({'key': ['value', 'value']})
+    >>> report['count_strings']  # 'value' is counted once
+    2
+    >>> report['total'] == report['objects'] + report['containers'] + report['strings'] + report['arrays']
+    True
+    """
+    report = {'objects': 0, 'containers': 0, 'strings': 0, 'arrays': 0,
+              'count_objects': 0, 'count_containers': 0, 'count_strings': 0, 'count_arrays': 0}
+    seen = set()
+    stack = [root]
+    while stack:
+        value = stack.pop()
+        if id(value) in seen or isinstance(value, SKIPPED_TYPES):
+            continue
+        seen.add(id(value))
+
+        if isinstance(value, np.ndarray):
+            category = 'arrays'
+            # includes the data buffer only if the array owns it, so views into a snapshot count as headers
+            size = sys.getsizeof(value)
+        elif isinstance(value, STRING_TYPES):
+            category = 'strings'
+            size = sys.getsizeof(value)
+        elif isinstance(value, CONTAINER_TYPES):
+            category = 'containers'
+            size = sys.getsizeof(value)
+            if isinstance(value, dict):
+                stack.extend(value.keys())
+                stack.extend(value.values())
+            else:
+                stack.extend(value)
+        else:
+            category = 'objects'
+            size = sys.getsizeof(value)
+            if hasattr(value, '__dict__'):
+                # the attribute dictionary is part of the object, not a separate container
+                size += sys.getsizeof(value.__dict__)
+                seen.add(id(value.__dict__))
+                stack.extend(value.__dict__.values())
+            for slot in getattr(type(value), '__slots__', ()):
+                if hasattr(value, slot):
+                    stack.append(getattr(value, slot))
+
+        report[category] += size
+        report['count_' + category] += 1
+
+    report['total'] = report['objects'] + report['containers'] + report['strings'] + report['arrays']
+    return report
+
+
+def profile_build(build: Callable[[], Any], top: int = 5) -> tuple[Any, dict[str, Any]]:
+    """Run build() under tracemalloc and return its result together with a build profile.
+
+    The profile maps 'current' and 'peak' to the bytes allocated by the build that are still alive and the
+    most that were alive at once, 'seconds' to the time taken, and 'top' to a list of (location, bytes)
+    pairs for the top allocation sites still alive at the end of the build. The profile slows the build down
+    considerably, so only use it to investigate memory usage.
+    """
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    start_current, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+
+    result = build()
+
+    seconds = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    stats = tracemalloc.take_snapshot().compare_to(before, 'lineno')
+    if not already_tracing:
+        tracemalloc.stop()
+
+    sites = [(str(stat.traceback), stat.size_diff) for stat in stats[:top]]
+    return result, {'current': current - start_current, 'peak': peak - start_current,
+                    'seconds': seconds, 'top': sites}
+
+
+def check_budget(estimate: int, budget: int, mode: str) -> bool:
+    """Return whether a build estimated to use estimate bytes fits in budget bytes.
+
+    If it does not fit and mode is 'refuse', raise a MemoryError instead of returning False. With mode
+    'downgrade', the caller is expected to use its compact backend when False is returned.
+
+    Preconditions:
+        - mode in {'refuse', 'downgrade'}
+
+    >>> check_budget(100, 200, 'refuse')
+    True
+    >>> check_budget(300, 200, 'downgrade')
+    False
+    """
+    if estimate <= budget:
+        return True
+    elif mode == 'refuse':
+        raise MemoryError(f'build is estimated to use {estimate} bytes, over the budget of {budget} bytes')
+    return False
+
+
+def format_report(report: dict[str, int]) -> str:
+    """Return a one-line human readable summary of a report from deep_size_report."""
+    parts = [f'{category} {report[category] / 1024:.1f} KiB ({report["count_" + category]})'
+             for category in ('objects', 'containers', 'strings', 'arrays')]
+    return f'total {report["total"] / 1024:.1f} KiB: ' + ', '.join(parts)
+
+
+if __name__ == '__main__':
+
+    import python_ta.contracts
+    import doctest
+
+    python_ta.contracts.check_all_contracts()
+
+    doctest.testmod(verbose='TRUE')
+
+    python_ta.check_all(config={
+        'extra-imports': ['__future__', 'sys', 'time', 'tracemalloc', 'types', 'typing', 'numpy'],
+        'allowed-io': [],     # the names (strs) of functions that call print/open/input
+        'max-line-length': 120
+    })
@@ -2,7 +2,7 @@
 Module Description
 ==================
 This module contains the Graph and _Vertex classes, as well as load_movie_actor_graph function, which creates the
-graph containing movies and actors.
+graph containing movies and the actors, directors and genres linked to them.
 
 Copyright and Usage Information
 ===============================
@@ -15,103 +15,164 @@ expressly prohibited.
 This file is Copyright (c) 2025 Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang
 """
 from __future__ import annotations
-from typing import Any
+import csv
+from typing import Any, Optional
 from movie_data import MovieData
+from memory import deep_size_report
+
+# The kinds of vertices in the graph, in the order an item is looked up when no kind is given
+KINDS = ('movie', 'actor', 'director', 'genre')
+
+# Approximate bytes used by each vertex (the _Vertex object, its partition dictionary, its item and its entry in
+# the graph) and each edge (two set slots, plus a partition set per new neighbour kind), measured with
+# deep_size_report on imdb_top_1000.csv
+VERTEX_BYTES = 560
+EDGE_BYTES = 120
 
 
 class _Vertex:
-    """A vertex in an Actor-Movie graph, used to represent an actor or a movie.
+    """A vertex in a movie graph, used to represent a movie, an actor, a director or a genre.
+
+    Each vertex item is either a FULL NAME, a movie title or a genre name, represented as strings.
 
-    Each vertex item is either a FULL NAME or a movie title, represented as strings.
+    The neighbours of a vertex are partitioned by their kind, so that the neighbours of one kind (e.g. the
+    movies of a director) can be read without looking at the others.
 
     Instance Attributes:
-        - item: The data stored in this vertex, representing an actor or a movie.
-        - kind: The type of this vertex: 'actor' or 'movie'.
-        - neighbours: The vertices that are adjacent to this vertex.
+        - item: The data stored in this vertex, representing a movie, an actor, a director or a genre.
+        - kind: The type of this vertex: 'movie', 'actor', 'director' or 'genre'.
+        - neighbours: Maps each kind to the vertices of that kind that are adjacent to this vertex.
 
     Representation Invariants:
-        - self not in self.neighbours
-        - all(self in u.neighbours for u in self.neighbours)
-        - self.kind in {'actor', 'movie'}
+        - all(self not in self.neighbours[k] for k in self.neighbours)
+        - all(self in u.neighbours[self.kind] for k in self.neighbours for u in self.neighbours[k])
+        - all(u.kind == k for k in self.neighbours for u in self.neighbours[k])
+        - self.kind in KINDS
     """
     item: Any
     kind: str
-    neighbours: set[_Vertex]
+    neighbours: dict[str, set[_Vertex]]
 
     def __init__(self, item: str, kind: str) -> None:
         """Initialize a new vertex with the given item and kind, with no neighbours.
 
         Preconditions:
-            - kind in {'movie', 'actor'}
+            - kind in KINDS
         """
         self.item = item
         self.kind = kind
-        self.neighbours = set()
+        self.neighbours = {}
+
+    def all_neighbours(self) -> set[_Vertex]:
+        """Return the vertices of every kind that are adjacent to this vertex."""
+        return set().union(*self.neighbours.values())
 
 
 class Graph:
-    """A graph used to represent actors and the movies they've been in."""
+    """A graph used to represent movies and the actors, directors and genres they are linked to."""
     # Private Instance Attributes:
     #     - _vertices:
     #         A collection of the vertices contained in this graph.
-    #         Maps item to _Vertex object.
-    _vertices: dict[Any, _Vertex]
+    #         Maps each kind to a dictionary mapping item to _Vertex object.
+    _vertices: dict[str, dict[Any, _Vertex]]
 
     def __init__(self) -> None:
         """Initialize an empty graph."""
-        self._vertices = {}
+        self._vertices = {kind: {} for kind in KINDS}
+
+    def _find(self, item: Any, kind: Optional[str] = None) -> Optional[_Vertex]:
+        """Return the vertex of the given item and kind, or None if there is no such vertex.
+        If kind is None, return the first vertex with the given item, trying the kinds in KINDS order.
+        """
+        if kind is not None:
+            return self._vertices.get(kind, {}).get(item)
+        for k in KINDS:
+            if item in self._vertices[k]:
+                return self._vertices[k][item]
+        return None
 
     def add_vertex(self, item: str, kind: str) -> None:
         """Add a vertex with the given item and kind to this graph.
 
         Preconditions:
-            - kind in {'actor', 'movie'}
+            - kind in KINDS
         """
-        self._vertices[item] = _Vertex(item, kind)
+        self._vertices[kind][item] = _Vertex(item, kind)
 
-    def add_edge(self, item1: str, item2: str) -> None:
+    def has_vertex(self, item: str, kind: Optional[str] = None) -> bool:
+        """Return whether this graph has a vertex with the given item (of the given kind, if it is not None)."""
+        return self._find(item, kind) is not None
+
+    def add_edge(self, item1: str, item2: str, kind1: Optional[str] = None, kind2: Optional[str] = None) -> None:
         """Add an edge between the two vertices with the given items in this graph.
+        kind1 and kind2 pick the kinds of the vertices when an item is used by more than one kind, e.g. a
+        person who is both an actor and a director.
 
         Raise a ValueError if item1 or item2 do not appear as vertices in this graph.
 
         Preconditions:
             - item1 != item2
         """
-
-        if item1 in self._vertices and item2 in self._vertices:
-            v1 = self._vertices[item1]
-            v2 = self._vertices[item2]
-
-            v1.neighbours.add(v2)
-            v2.neighbours.add(v1)
+        v1 = self._find(item1, kind1)
+        v2 = self._find(item2, kind2)
+        if v1 is not None and v2 is not None:
+            v1.neighbours.setdefault(v2.kind, set()).add(v2)
+            v2.neighbours.setdefault(v1.kind, set()).add(v1)
         else:
             raise ValueError
 
-    def get_neighbours(self, item: str) -> set:
-        """Return a set of the neighbours of the given item.
+    def get_neighbours(self, item: str, kind: Optional[str] = None, item_kind: Optional[str] = None) -> set:
+        """Return a set of the neighbours of the given item. If kind is given, return only the neighbours of that
+        kind, which takes time proportional to the number returned rather than to the number of neighbours.
+        item_kind picks the kind of the item when it is used by more than one kind.
 
         Raise a ValueError if item does not appear as a vertex in this graph.
         """
-        if item in self._vertices:
-            v = self._vertices[item]
-            return {neighbour.item for neighbour in v.neighbours}
-        else:
+        v = self._find(item, item_kind)
+        if v is None:
             raise ValueError
+        elif kind is not None:
+            return {neighbour.item for neighbour in v.neighbours.get(kind, ())}
+        else:
+            return {neighbour.item for neighbour in v.all_neighbours()}
 
     def get_vertices(self, kind: str) -> set:
         """Return a set of all vertices' items of the argumented kind"""
 
-        return {self._vertices[x].item for x in self._vertices if self._vertices[x].kind == kind}
+        return set(self._vertices.get(kind, {}))
+
+    def to_adjacency(self, kinds: Optional[set[str]] = None) -> tuple[list[Any], list[str], list[list[int]]]:
+        """Return this graph with its vertices numbered 0 to n - 1, as a tuple of the item of each vertex, the kind
+        of each vertex and the sorted neighbour numbers of each vertex.
+        If kinds is given, only the vertices of those kinds (and the edges between them) are included.
+
+        >>> g = Graph()
+        >>> g.add_vertex('The Godfather', 'movie')
+        >>> g.add_vertex('Al Pacino', 'actor')
+        >>> g.add_edge('The Godfather', 'Al Pacino')
+        >>> g.to_adjacency()
+        (['The Godfather', 'Al Pacino'], ['movie', 'actor'], [[1], [0]])
+        """
+        included = [k for k in KINDS if kinds is None or k in kinds]
+        vertices = [v for k in included for v in self._vertices[k].values()]
+        numbers = {id(v): i for i, v in enumerate(vertices)}
+        neighbours = [sorted(numbers[id(u)] for k in included for u in v.neighbours.get(k, ())) for v in vertices]
+        return [v.item for v in vertices], [v.kind for v in vertices], neighbours
+
+    def memory_report(self) -> dict[str, int]:
+        """Return a breakdown of the bytes used by this graph, as returned by memory.deep_size_report."""
+        return deep_size_report(self)
 
 
 def load_movie_actor_graph(movie_file: str) -> Graph:
-    """Return a graph corresponding to the given datasets.
+    """Return a graph corresponding to the given datasets, built in a single pass over the movies.
 
-    Create one vertex for each actor and one vertex for each movie.
-    Edges represent an actor being in a movie.
+    Create one vertex for each movie, actor, director and genre.
+    Edges represent an actor being in a movie, a director directing a movie and a movie being in a genre.
 
-    The vertices of the 'actor' kind have the 'actor's FULL NAME' as its item.
+    The vertices of the 'actor' and 'director' kinds have the person's FULL NAME as its item.
     The vertices of the 'movie' kind have the movie TITLE as its item.
+    The vertices of the 'genre' kind have the genre name as its item.
 
     Preconditions:
         - movie_file is the path to a CSV file corresponding to the movie data
@@ -121,11 +182,17 @@ def load_movie_actor_graph(movie_file: str) -> Graph:
     4
     >>> len(g.get_vertices(kind='actor'))
     14
-    >>> cast = g.get_neighbours('The Godfather')
+    >>> cast = g.get_neighbours('The Godfather', 'actor')
     >>> len(cast)
     4
     >>> 'Al Pacino' in cast
     True
+    >>> g.get_neighbours('The Godfather', 'director')
+    {'Francis Ford Coppola'}
+    >>> len(g.get_neighbours('Francis Ford Coppola', 'movie'))
+    2
+    >>> sorted(g.get_neighbours('Crime', 'movie'))
+    ['The Dark Knight', 'The Godfather', 'The Godfather: Part II']
     """
 
     graph = Graph()
@@ -136,14 +203,47 @@ def load_movie_actor_graph(movie_file: str) -> Graph:
         graph.add_vertex(movie, 'movie')
 
         for actor in moviedata[movie].cast_director[0]:
-            if actor not in graph.get_vertices(kind='actor'):
+            if not graph.has_vertex(actor, 'actor'):
                 graph.add_vertex(actor, 'actor')
+            graph.add_edge(movie, actor, 'movie', 'actor')
+
+        director = moviedata[movie].cast_director[1]
+        if director:
+            if not graph.has_vertex(director, 'director'):
+                graph.add_vertex(director, 'director')
+            graph.add_edge(movie, director, 'movie', 'director')
 
-            graph.add_edge(movie, actor)
+        genres = moviedata[movie].genre_runtime[0]
+        for genre in genres.split(', ') if genres else []:
+            if not graph.has_vertex(genre, 'genre'):
+                graph.add_vertex(genre, 'genre')
+            graph.add_edge(movie, genre, 'movie', 'genre')
 
     return graph
 
 
+def estimate_graph_bytes(movie_file: str) -> int:
+    """Return an estimate of the bytes load_movie_actor_graph(movie_file) would use, from a scan of the file
+    that does not build the graph.
+
+    Preconditions:
+        - movie_file is the path to a CSV file corresponding to the movie data
+    """
+    vertices = set()
+    edges = set()
+    with open(movie_file, 'r', encoding='latin-1') as f:
+        for row in csv.DictReader(f, delimiter=","):
+            title = row["Series_Title"]
+            vertices.add(('movie', title))
+            linked = [('actor', row[star]) for star in ("Star1", "Star2", "Star3", "Star4")]
+            linked.append(('director', row["Director"]))
+            linked.extend(('genre', genre) for genre in row["Genre"].split(', ') if genre)
+            for vertex in linked:
+                vertices.add(vertex)
+                edges.add((title, vertex))
+    return len(vertices) * VERTEX_BYTES + len(edges) * EDGE_BYTES
+
+
 if __name__ == '__main__':
 
     import python_ta.contracts
@@ -154,7 +254,7 @@ if __name__ == '__main__':
     doctest.testmod(verbose='TRUE')
 
     python_ta.check_all(config={
-        'extra-imports': ['__future__', 'movie_data', 'typing'],  # the names (strs) of imported modules
-        'allowed-io': [],     # the names (strs) of functions that call print/open/input
+        'extra-imports': ['__future__', 'csv', 'movie_data', 'memory', 'typing'],  # imported modules
+        'allowed-io': ['estimate_graph_bytes'],     # the names (strs) of functions that call print/open/input
         'max-line-length': 120
     })
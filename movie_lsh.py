@@ -0,0 +1,246 @@
+"""
+Module Description
+==================
+This module contains the MovieLSH class and load_movie_lsh function, which build an approximate similarity
+index over the cast and genres of each movie.
+
+Each movie is described by a set of tokens: its cast (the movie's neighbours in the movie-actor Graph) and
+its genres. A MinHash signature is computed for every token set, and the signatures are split into bands
+which are hashed into buckets (locality-sensitive hashing). Movies that share a bucket in at least one band
+are candidates for being similar, so a lookup only compares against a small number of candidates instead of
+every movie in the dataset.
+
+The recall/latency trade-off is controlled by the number of bands and the rows per band:
+- more bands with fewer rows each finds more similar pairs (higher recall) but returns more candidates
+- fewer bands with more rows each returns fewer candidates (faster) but misses more pairs
+
+Copyright and Usage Information
+===============================
+
+This file is solely for the personal and private use of
+Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited.
+
+This file is Copyright (c) 2025 Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang
+"""
+from __future__ import annotations
+import zlib
+import numpy as np
+from movie_data import MovieData
+from movie_actor_graph import Graph, load_movie_actor_graph
+
+# A Mersenne prime used for the universal hash functions ((a * x + b) mod PRIME).
+# Token hashes are reduced below it so that a * x always fits in an unsigned 64-bit integer.
+PRIME = (1 << 31) - 1
+
+
+def movie_tokens(graph: Graph, moviedata: dict) -> dict[str, set[str]]:
+    """Return a dictionary mapping each movie title to its token set: its cast and its genres.
+
+    Cast members are taken from the movie's neighbours in the graph and are prefixed with 'actor:'.
+    Genres are taken from the movie data and are prefixed with 'genre:', so that an actor and a genre
+    with the same name are never treated as the same token.
+
+    >>> g = load_movie_actor_graph("movie_data_small.csv")
+    >>> tokens = movie_tokens(g, MovieData.load_movie_basics("movie_data_small.csv"))
+    >>> sorted(tokens['The Godfather'])[:2]
+    ['actor:Al Pacino', 'actor:Diane Keaton']
+    >>> 'genre:Crime' in tokens['The Godfather']
+    True
+    """
+    tokens = {}
+    for title in graph.get_vertices('movie'):
+        cast = {'actor:' + actor for actor in graph.get_neighbours(title, 'actor', 'movie')}
+        genres = set()
+        if title in moviedata and moviedata[title].genre_runtime[0]:
+            genres = {'genre:' + genre for genre in moviedata[title].genre_runtime[0].split(', ')}
+        tokens[title] = cast | genres
+    return tokens
+
+
+def jaccard(set1: set, set2: set) -> float:
+    """Return the exact Jaccard similarity of the two given sets.
+
+    >>> jaccard({1, 2, 3}, {2, 3, 4})
+    0.5
+    >>> jaccard(set(), set())
+    0.0
+    """
+    union = len(set1 | set2)
+    if union == 0:
+        return 0.0
+    return len(set1 & set2) / union
+
+
+class MovieLSH:
+    """An approximate similarity index over the token sets of movies, using MinHash and LSH banding.
+
+    Instance Attributes:
+        - bands: the number of bands each signature is split into
+        - rows: the number of signature values in each band
+        - titles: the movie titles in this index, in insertion order
+
+    Representation Invariants:
+        - self.bands >= 1 and self.rows >= 1
+        - len(self.titles) == self._signatures.shape[0]
+    """
+    bands: int
+    rows: int
+    titles: list[str]
+    # Private Instance Attributes:
+    #     - _coeffs: the (a, b) coefficients of the bands * rows hash functions, as a 2 x (bands * rows) array
+    #     - _signatures: the MinHash signature of each movie, one row per title
+    #     - _index: maps each title to its row in _signatures
+    #     - _tokens: maps each title to its token set, used to rank candidates by exact similarity
+    #     - _buckets: one dictionary per band, mapping a band's bytes to the titles hashed into that bucket
+    _coeffs: np.ndarray
+    _signatures: np.ndarray
+    _index: dict[str, int]
+    _tokens: dict[str, set[str]]
+    _buckets: list[dict[bytes, list[str]]]
+
+    def __init__(self, bands: int = 32, rows: int = 3, seed: int = 111) -> None:
+        """Initialize an empty index with the given banding parameters.
+
+        Preconditions:
+            - bands >= 1
+            - rows >= 1
+        """
+        self.bands = bands
+        self.rows = rows
+        self.titles = []
+        rng = np.random.default_rng(seed)
+        num_perm = bands * rows
+        self._coeffs = np.stack([rng.integers(1, PRIME, num_perm, dtype=np.uint64),
+                                 rng.integers(0, PRIME, num_perm, dtype=np.uint64)])
+        self._signatures = np.empty((0, num_perm), dtype=np.uint64)
+        self._index = {}
+        self._tokens = {}
+        self._buckets = [{} for _ in range(bands)]
+
+    def signature(self, tokens: set[str]) -> np.ndarray:
+        """Return the MinHash signature of the given token set.
+
+        An empty token set gets a signature of all PRIME, which matches no non-empty set.
+        """
+        if not tokens:
+            return np.full(self.bands * self.rows, PRIME, dtype=np.uint64)
+        hashes = np.array([zlib.crc32(token.encode('utf-8')) % PRIME for token in tokens], dtype=np.uint64)
+        a, b = self._coeffs
+        return ((np.outer(hashes, a) + b) % PRIME).min(axis=0)
+
+    def build(self, tokens: dict[str, set[str]]) -> None:
+        """Add every movie in the given mapping of titles to token sets to this index."""
+        titles = [title for title in tokens if title not in self._index]
+        signatures = [self.signature(tokens[title]) for title in titles]
+        if signatures:
+            self._signatures = np.vstack([self._signatures, np.array(signatures)])
+
+        for title, sig in zip(titles, signatures):
+            self._index[title] = len(self.titles)
+            self.titles.append(title)
+            self._tokens[title] = tokens[title]
+            for band in range(self.bands):
+                key = sig[band * self.rows:(band + 1) * self.rows].tobytes()
+                self._buckets[band].setdefault(key, []).append(title)
+
+    def candidates(self, title: str) -> set[str]:
+        """Return the titles that share at least one band bucket with the given title, excluding itself.
+
+        Raise a ValueError if title is not in this index.
+        """
+        if title not in self._index:
+            raise ValueError
+        sig = self._signatures[self._index[title]]
+        found = set()
+        for band in range(self.bands):
+            key = sig[band * self.rows:(band + 1) * self.rows].tobytes()
+            found.update(self._buckets[band].get(key, []))
+        found.discard(title)
+        return found
+
+    def estimate(self, title1: str, title2: str) -> float:
+        """Return the MinHash estimate of the Jaccard similarity of the two given titles.
+
+        Raise a ValueError if either title is not in this index.
+        """
+        if title1 not in self._index or title2 not in self._index:
+            raise ValueError
+        sig1 = self._signatures[self._index[title1]]
+        sig2 = self._signatures[self._index[title2]]
+        return float(np.mean(sig1 == sig2))
+
+    def similar(self, title: str, k: int = 10, threshold: float = 0.0) -> list[tuple[str, float]]:
+        """Return up to k (title, similarity) pairs for the movies most similar to the given title.
+
+        Only the LSH candidates are scored, using the exact Jaccard similarity of their token sets.
+        Pairs with a similarity below threshold are dropped. Ties are broken by title.
+
+        Raise a ValueError if title is not in this index.
+        """
+        tokens = self._tokens.get(title)
+        scored = []
+        for other in self.candidates(title):
+            score = jaccard(tokens, self._tokens[other])
+            if score >= threshold and score > 0:
+                scored.append((other, score))
+        scored.sort(key=lambda pair: (-pair[1], pair[0]))
+        return scored[:k]
+
+    def near_duplicates(self, threshold: float = 0.8) -> list[tuple[str, str, float]]:
+        """Return every pair of movies whose exact Jaccard similarity is at least threshold.
+
+        Only pairs that share a bucket are compared, so pairs the index misses are not returned.
+        """
+        pairs = []
+        for title in self.titles:
+            for other in self.candidates(title):
+                if title < other:
+                    score = jaccard(self._tokens[title], self._tokens[other])
+                    if score >= threshold:
+                        pairs.append((title, other, score))
+        pairs.sort(key=lambda triple: (-triple[2], triple[0], triple[1]))
+        return pairs
+
+
+def brute_force_similar(tokens: dict[str, set[str]], title: str, threshold: float) -> set[str]:
+    """Return every title (other than the given one) whose exact Jaccard similarity with title is at least
+    threshold, by comparing against every movie. Used as the ground truth for MovieLSH.
+    """
+    return {other for other in tokens
+            if other != title and jaccard(tokens[title], tokens[other]) >= threshold}
+
+
+def load_movie_lsh(movie_file: str, bands: int = 32, rows: int = 3) -> MovieLSH:
+    """Return a MovieLSH index over the cast and genres of every movie in the given dataset.
+
+    Preconditions:
+        - movie_file is the path to a CSV file corresponding to the movie data
+
+    >>> lsh = load_movie_lsh("movie_data_small.csv", bands=16, rows=2)
+    >>> len(lsh.titles)
+    4
+    >>> lsh.estimate('The Godfather', 'The Godfather')
+    1.0
+    """
+    graph = load_movie_actor_graph(movie_file)
+    lsh = MovieLSH(bands, rows)
+    lsh.build(movie_tokens(graph, MovieData.load_movie_basics(movie_file)))
+    return lsh
+
+
+if __name__ == '__main__':
+
+    import python_ta.contracts
+    import doctest
+
+    python_ta.contracts.check_all_contracts()
+
+    doctest.testmod(verbose='TRUE')
+
+    python_ta.check_all(config={
+        'extra-imports': ['__future__', 'zlib', 'numpy', 'movie_data', 'movie_actor_graph'],
+        'allowed-io': [],     # the names (strs) of functions that call print/open/input
+        'max-line-length': 120
+    })
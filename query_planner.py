@@ -0,0 +1,207 @@
+"""
+Module Description
+==================
+This module contains the MovieQueryEngine class and load_query_engine function, which answer queries combining
+any of the actor, director, genre, runtime, release year and rating predicates in one call.
+
+When the engine is built it precomputes, for every actor (Star1 to Star4), director and genre, the sorted row ids
+of their movies, and sorted columns (a RangeIndex) for the numeric predicates. Every predicate is evaluated on
+the same row ids, and its number of matching rows is known without evaluating it: the length of a posting list,
+or two binary searches for a range. A query is planned by estimating the number of movies each predicate
+matches, then evaluating the most selective predicate first and intersecting the remaining predicates with the
+candidates in increasing order of size. explain() shows the plan together with how many candidates were left and
+how long each step took.
+
+Copyright and Usage Information
+===============================
+
+This file is solely for the personal and private use of
+Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited.
+
+This file is Copyright (c) 2025 Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang
+"""
+from __future__ import annotations
+import csv
+import time
+from typing import Any, Optional
+import numpy as np
+from range_index import RangeIndex, COLUMNS, parse_number
+
+# The inclusive runtime range (in whole minutes) of each runtime bin used by BinaryCSV, which bins with pd.cut
+# on the intervals (0, 60], (60, 90], (90, 120], (120, 180], (180, 240], (240, inf)
+RUNTIME_BINS = {
+    'very-short': (None, 60),
+    'short': (61, 90),
+    'mid': (91, 120),
+    'mid-long': (121, 180),
+    'long': (181, 240),
+    'very-long': (241, None)
+}
+
+
+class MovieQueryEngine:
+    """A query engine over the movie dataset that plans multi-predicate queries by estimated selectivity.
+
+    Each movie is identified by its row id, its 0-based position in the dataset.
+
+    Instance Attributes:
+        - titles: the title of each movie, indexed by row id
+
+    Representation Invariants:
+        - all(len(self._genres[g]) <= len(self.titles) for g in self._genres)
+    """
+    titles: list[str]
+    # Private Instance Attributes:
+    #     - _actors: maps each actor to the sorted row ids of the movies they star in
+    #     - _directors: maps each director to the sorted row ids of their movies
+    #     - _genres: maps each genre to the sorted row ids of the movies in it
+    #     - _ranges: the sorted-column index for the runtime, year and rating predicates
+    _actors: dict[str, np.ndarray]
+    _directors: dict[str, np.ndarray]
+    _genres: dict[str, np.ndarray]
+    _ranges: RangeIndex
+
+    def __init__(self, rows: list[dict[str, str]]) -> None:
+        """Initialize the engine from the rows of the movie dataset."""
+        self.titles = [row["Series_Title"] for row in rows]
+        actors = {}
+        directors = {}
+        genres = {}
+        for row_id, row in enumerate(rows):
+            for actor in {row["Star1"], row["Star2"], row["Star3"], row["Star4"]}:
+                if actor:
+                    actors.setdefault(actor, []).append(row_id)
+            directors.setdefault(row["Director"], []).append(row_id)
+            for genre in row["Genre"].split(', '):
+                if genre:
+                    genres.setdefault(genre, []).append(row_id)
+        self._actors = {a: np.array(ids, dtype=np.int64) for a, ids in actors.items()}
+        self._directors = {d: np.array(ids, dtype=np.int64) for d, ids in directors.items()}
+        self._genres = {g: np.array(ids, dtype=np.int64) for g, ids in genres.items()}
+        self._ranges = RangeIndex(self.titles, {name: [parse_number(row[COLUMNS[name]]) for row in rows]
+                                                for name in ('runtime', 'year', 'rating')})
+
+    def plan(self, actor: Optional[str] = None, director: Optional[str] = None, genres: Optional[list[str]] = None,
+             runtime: Any = None, year: Optional[tuple] = None, rating: Optional[tuple] = None) -> list[tuple]:
+        """Return the plan for a query: a list of (predicate, argument, estimated rows) tuples, in the order they
+        are evaluated (fewest estimated rows first). Predicates that are None are left out.
+
+        runtime is either a runtime bin label (a key of RUNTIME_BINS) or an inclusive (low, high) range in
+        minutes; year and rating are inclusive (low, high) ranges, where a bound of None is open. A movie must
+        be in every genre in genres. Unknown actors, directors and genres are estimated to match no rows.
+        """
+        steps = []
+        if actor is not None:
+            steps.append(('actor', actor, len(self._actors.get(actor, []))))
+        if director is not None:
+            steps.append(('director', director, len(self._directors.get(director, []))))
+        for genre in genres or []:
+            steps.append(('genre', genre, len(self._genres.get(genre, []))))
+        if runtime is not None:
+            low, high = RUNTIME_BINS[runtime] if isinstance(runtime, str) else runtime
+            steps.append(('runtime', (low, high), self._ranges.count('runtime', low, high)))
+        if year is not None:
+            steps.append(('year', year, self._ranges.count('year', *year)))
+        if rating is not None:
+            steps.append(('rating', rating, self._ranges.count('rating', *rating)))
+        steps.sort(key=lambda step: step[2])
+        return steps
+
+    def _evaluate(self, step: tuple, candidates: Optional[np.ndarray]) -> np.ndarray:
+        """Return the sorted row ids matching the given plan step, restricted to candidates if it is not None."""
+        predicate, argument, _ = step
+        if predicate in ('runtime', 'year', 'rating'):
+            if candidates is None:
+                return self._ranges.range_ids(predicate, *argument)
+            return self._ranges.filter_ids(candidates, predicate, *argument)
+
+        if predicate == 'actor':
+            matched = self._actors.get(argument, np.array([], dtype=np.int64))
+        elif predicate == 'director':
+            matched = self._directors.get(argument, np.array([], dtype=np.int64))
+        else:
+            matched = self._genres.get(argument, np.array([], dtype=np.int64))
+
+        if candidates is None:
+            return matched
+        return np.intersect1d(candidates, matched, assume_unique=True)
+
+    def _run(self, steps: list[tuple]) -> tuple[np.ndarray, list[tuple[int, float]]]:
+        """Evaluate the given plan. Return the matching row ids and, for each step that was evaluated, the
+        number of candidates left after it and the time it took in milliseconds.
+        """
+        candidates = None
+        trace = []
+        for step in steps:
+            start = time.perf_counter()
+            candidates = self._evaluate(step, candidates)
+            trace.append((len(candidates), (time.perf_counter() - start) * 1000))
+            if len(candidates) == 0:
+                break
+        if candidates is None:
+            candidates = np.arange(len(self.titles))
+        return candidates, trace
+
+    def search(self, actor: Optional[str] = None, director: Optional[str] = None,
+               genres: Optional[list[str]] = None, runtime: Any = None, year: Optional[tuple] = None,
+               rating: Optional[tuple] = None) -> list[str]:
+        """Return the titles of the movies matching every given predicate, in dataset order.
+        The arguments are the same as for plan.
+
+        >>> engine = load_query_engine("movie_data_small.csv")
+        >>> engine.search(actor='Al Pacino', runtime='mid-long')
+        ['The Godfather']
+        >>> engine.search(genres=['Crime', 'Drama'], year=(1973, 2000))
+        ['The Godfather: Part II']
+        """
+        ids, _ = self._run(self.plan(actor, director, genres, runtime, year, rating))
+        return [self.titles[i] for i in ids]
+
+    def explain(self, actor: Optional[str] = None, director: Optional[str] = None,
+                genres: Optional[list[str]] = None, runtime: Any = None, year: Optional[tuple] = None,
+                rating: Optional[tuple] = None) -> str:
+        """Run the query and return a description of its plan: one line per step with its estimated rows, the
+        candidates left after it and the time it took. Steps skipped because no candidates were left are
+        marked as such. The arguments are the same as for plan.
+        """
+        steps = self.plan(actor, director, genres, runtime, year, rating)
+        ids, trace = self._run(steps)
+        lines = [f'{len(steps)} predicates over {len(self.titles)} movies, {len(ids)} results']
+        for i, (predicate, argument, estimate) in enumerate(steps):
+            line = f'{i + 1}. {predicate} {argument!r}: estimated {estimate} rows'
+            if i < len(trace):
+                remaining, elapsed = trace[i]
+                line += f', {remaining} candidates left, {elapsed:.3f} ms'
+            else:
+                line += ', skipped (no candidates left)'
+            lines.append(line)
+        return '\n'.join(lines)
+
+
+def load_query_engine(movie_file: str) -> MovieQueryEngine:
+    """Return a MovieQueryEngine over the given dataset.
+
+    Preconditions:
+        - movie_file is the path to a CSV file corresponding to the movie data
+    """
+    with open(movie_file, 'r', encoding='latin-1') as f:
+        rows = list(csv.DictReader(f, delimiter=","))
+    return MovieQueryEngine(rows)
+
+
+if __name__ == '__main__':
+
+    import python_ta.contracts
+    import doctest
+
+    python_ta.contracts.check_all_contracts()
+
+    doctest.testmod(verbose='TRUE')
+
+    python_ta.check_all(config={
+        'extra-imports': ['__future__', 'csv', 'time', 'typing', 'numpy', 'range_index'],
+        'allowed-io': ['load_query_engine'],     # the names (strs) of functions that call print/open/input
+        'max-line-length': 120
+    })
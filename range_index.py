@@ -0,0 +1,228 @@
+"""
+Module Description
+==================
+This module contains the RangeIndex class and load_range_index function, which answer numeric range filters
+(release year, IMDB rating, Meta score, number of votes and exact runtime) over the movie dataset without
+scanning every row.
+
+Each numeric column is stored as an array of values plus the permutation of row ids that sorts it. A range
+filter is two binary searches (np.searchsorted) into the sorted values, which gives the ids of every matching
+row as a contiguous slice of the permutation. A query over several columns starts from the column with the
+fewest matching rows and checks only those rows against the other ranges.
+
+Row ids are the positions of the movies in title order, one row per title, which is the order of the decision
+csv (and so of the MovieSignatureIndex and its genre/runtime bitsets) and of the movie ids of an EngineSnapshot.
+The results can be turned into bitsets (boolean arrays over every row) and intersected with those filters.
+
+Copyright and Usage Information
+===============================
+
+This file is solely for the personal and private use of
+Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited.
+
+This file is Copyright (c) 2025 Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang
+"""
+from __future__ import annotations
+import csv
+import re
+from typing import Optional
+import numpy as np
+
+# Maps the name of each filterable column to its column in the movie dataset
+COLUMNS = {
+    'year': 'Released_Year',
+    'rating': 'IMDB_Rating',
+    'meta_score': 'Meta_score',
+    'votes': 'No_of_Votes',
+    'runtime': 'Runtime'
+}
+
+
+def parse_number(value: str) -> float:
+    """Return the first number in the given string (ignoring thousands separators), or nan if there is none.
+
+    >>> parse_number('142 min')
+    142.0
+    >>> parse_number('2,343,110')
+    2343110.0
+    >>> parse_number('')
+    nan
+    """
+    match = re.search(r'\d+(\.\d+)?', value.replace(',', ''))
+    if match is None:
+        return float('nan')
+    return float(match.group())
+
+
+class RangeIndex:
+    """A sorted-column index answering inclusive numeric range filters over the rows of the movie dataset.
+
+    Instance Attributes:
+        - titles: the title of each row, indexed by row id
+
+    Representation Invariants:
+        - all(len(self._values[c]) == len(self.titles) for c in self._values)
+        - all(len(self._order[c]) <= len(self.titles) for c in self._order)
+    """
+    titles: list[str]
+    # Private Instance Attributes:
+    #     - _values: maps each column name to the value of every row, indexed by row id (nan if missing)
+    #     - _order: maps each column name to the row ids sorted by value, with the missing values left out
+    #     - _sorted: maps each column name to its values in sorted order, aligned with _order
+    _values: dict[str, np.ndarray]
+    _order: dict[str, np.ndarray]
+    _sorted: dict[str, np.ndarray]
+
+    def __init__(self, titles: list[str], columns: dict[str, list[float]]) -> None:
+        """Initialize the index from the title of each row and the values of each column, indexed by row id.
+
+        Preconditions:
+            - all(len(columns[c]) == len(titles) for c in columns)
+        """
+        self.titles = titles
+        self._values = {}
+        self._order = {}
+        self._sorted = {}
+        for name, values in columns.items():
+            array = np.array(values, dtype=np.float64)
+            order = np.argsort(array, kind='stable')
+            # argsort puts the nan values last, so drop them from the sorted view
+            order = order[:np.count_nonzero(~np.isnan(array))]
+            self._values[name] = array
+            self._order[name] = order
+            self._sorted[name] = array[order]
+
+    def add_sorted_column(self, name: str, values: np.ndarray, order: np.ndarray) -> None:
+        """Add a column whose sort order is already known, without sorting it again.
+
+        Preconditions:
+            - len(values) == len(self.titles)
+            - order is the row ids of the non-nan values sorted by value (as built by __init__)
+        """
+        self._values[name] = values
+        self._order[name] = order
+        self._sorted[name] = values[order]
+
+    def columns(self) -> list[str]:
+        """Return the names of the columns in this index."""
+        return list(self._values)
+
+    def _bounds(self, column: str, low: Optional[float], high: Optional[float]) -> tuple[int, int]:
+        """Return the slice [start, end) of the sorted view of column holding the values in [low, high].
+
+        Raise a ValueError if column is not in this index.
+        """
+        if column not in self._sorted:
+            raise ValueError
+        values = self._sorted[column]
+        start = 0 if low is None else int(np.searchsorted(values, low, side='left'))
+        end = len(values) if high is None else int(np.searchsorted(values, high, side='right'))
+        return start, max(start, end)
+
+    def count(self, column: str, low: Optional[float] = None, high: Optional[float] = None) -> int:
+        """Return the number of rows whose value in column is in [low, high], without materializing them.
+
+        A bound of None leaves that side of the range open. Raise a ValueError if column is not in this index.
+        """
+        start, end = self._bounds(column, low, high)
+        return end - start
+
+    def range_ids(self, column: str, low: Optional[float] = None, high: Optional[float] = None) -> np.ndarray:
+        """Return the ids of the rows whose value in column is in [low, high], sorted by id.
+
+        A bound of None leaves that side of the range open. Raise a ValueError if column is not in this index.
+        """
+        start, end = self._bounds(column, low, high)
+        return np.sort(self._order[column][start:end])
+
+    def filter_ids(self, ids: np.ndarray, column: str, low: Optional[float] = None,
+                   high: Optional[float] = None) -> np.ndarray:
+        """Return the ids in the given array whose value in column is in [low, high], keeping their order.
+
+        This costs O(len(ids)), so it is cheaper than range_ids when ids is smaller than the range.
+        Raise a ValueError if column is not in this index.
+        """
+        if column not in self._values:
+            raise ValueError
+        values = self._values[column][ids]
+        keep = ~np.isnan(values)
+        if low is not None:
+            keep &= values >= low
+        if high is not None:
+            keep &= values <= high
+        return ids[keep]
+
+    def to_bitset(self, ids: np.ndarray) -> np.ndarray:
+        """Return a boolean array over every row, true exactly for the given row ids."""
+        bitset = np.zeros(len(self.titles), dtype=bool)
+        bitset[ids] = True
+        return bitset
+
+    def query(self, ranges: dict[str, tuple[Optional[float], Optional[float]]],
+              bitset: Optional[np.ndarray] = None) -> np.ndarray:
+        """Return the ids (sorted) of the rows that satisfy every (low, high) range in ranges, and are true in
+        the given bitset if there is one.
+
+        The column with the fewest matching rows is read from the index; only those rows are checked against
+        the other ranges, so the cost depends on the most selective range rather than on the number of rows.
+
+        Raise a ValueError if a column in ranges is not in this index.
+
+        >>> index = RangeIndex(['a', 'b', 'c', 'd'], {'year': [1994, 1972, 2008, 1974],
+        ...                                           'rating': [9.3, 9.2, 9.0, 9.0]})
+        >>> [int(i) for i in index.query({'year': (1970, 2000), 'rating': (9.1, None)})]
+        [0, 1]
+        """
+        if not ranges:
+            ids = np.arange(len(self.titles))
+        else:
+            bounds = {column: self._bounds(column, *ranges[column]) for column in ranges}
+            first = min(bounds, key=lambda column: bounds[column][1] - bounds[column][0])
+            start, end = bounds[first]
+            ids = np.sort(self._order[first][start:end])
+            for column in ranges:
+                if column != first:
+                    ids = self.filter_ids(ids, column, *ranges[column])
+        if bitset is not None:
+            ids = ids[bitset[ids]]
+        return ids
+
+
+def load_range_index(movie_file: str) -> RangeIndex:
+    """Return a RangeIndex over every column in COLUMNS of the given dataset, with one row per title, in title
+    order (the order of the decision csv). If several CSV rows share a title, the first one is used, as in
+    snapshot.write_snapshot.
+
+    Preconditions:
+        - movie_file is the path to a CSV file corresponding to the movie data
+
+    >>> index = load_range_index("movie_data_small.csv")
+    >>> [index.titles[i] for i in index.query({'year': (1990, 2005), 'runtime': (95, 150)})]
+    ['The Shawshank Redemption']
+    """
+    first_rows = {}
+    with open(movie_file, 'r', encoding='latin-1') as f:
+        reader = csv.DictReader(f, delimiter=",")
+        for row in reader:
+            first_rows.setdefault(row["Series_Title"], row)
+    titles = sorted(first_rows)
+    columns = {name: [parse_number(first_rows[title][column]) for title in titles] for name, column in COLUMNS.items()}
+    return RangeIndex(titles, columns)
+
+
+if __name__ == '__main__':
+
+    import python_ta.contracts
+    import doctest
+
+    python_ta.contracts.check_all_contracts()
+
+    doctest.testmod(verbose='TRUE')
+
+    python_ta.check_all(config={
+        'extra-imports': ['__future__', 'csv', 're', 'typing', 'numpy'],
+        'allowed-io': ['load_range_index'],     # the names (strs) of functions that call print/open/input
+        'max-line-length': 120
+    })
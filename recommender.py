@@ -25,14 +25,63 @@ This file is Copyright (c) 2025 Victoria Cai, Isabella Zhong, Maya Dowman, Grace
 """
 
 from __future__ import annotations
-from typing import Any
+from typing import Any, Optional
 import csv
+import os
 import pickle
 import tkinter as tk
 from tkinter import ttk, messagebox
 import tkinter.font as tkfont
-from tree import MovieDecisionTree, BinaryCSV, Movie
-from movie_actor_graph import Graph, load_movie_actor_graph
+import numpy as np
+from tree import MovieDecisionTree, MovieSignatureIndex, BinaryCSV, Movie, encode_batch
+from movie_actor_graph import load_movie_actor_graph
+from movie_data import MovieData
+from live_index import MovieIndex, IndexHandle
+from memory import check_budget
+from snapshot import EngineSnapshot, load_graph_within_budget, open_snapshot, write_snapshot
+
+# Bytes used per decision tree node, and per movie leaf (the leaf node only: its Movie is shared with the
+# signature index), measured with memory.deep_size_report on the trees built from imdb_top_1000.csv
+TREE_NODE_BYTES = 240
+TREE_LEAF_BYTES = 360
+
+# Bytes used per movie by the signature index (its Movie, packed signature and bit of each feature column),
+# measured with memory.deep_size_report on the index built from imdb_top_1000.csv
+SIGNATURE_MOVIE_BYTES = 540
+
+# Maps each runtime option of the preference screen to its decision csv column
+LENGTH_MAP = {
+    "0-60 minutes": "runtime_bin_very-short",
+    "60-90 minutes": "runtime_bin_short",
+    "90-120 minutes": "runtime_bin_mid",
+    "120-180 minutes": "runtime_bin_mid-long",
+    "180-240 minutes": "runtime_bin_long",
+    "240+ minutes": "runtime_bin_very-long"
+}
+# Maps each genre option of the preference screen to its decision csv column
+GENRE_MAP = {
+    "Action": "genre_Action",
+    "Animation": "genre_Animation",
+    "Adventure": "genre_Adventure",
+    "Biography": "genre_Biography",
+    "Comedy": "genre_Comedy",
+    "Crime": "genre_Crime",
+    "Drama": "genre_Drama",
+    "Family": "genre_Family",
+    "Fantasy": "genre_Fantasy",
+    "Film-Noir": "genre_Film-Noir",
+    "History": "genre_History",
+    "Horror": "genre_Horror",
+    "Music": "genre_Music",
+    "Musical": "genre_Musical",
+    "Mystery": "genre_Mystery",
+    "Romance": "genre_Romance",
+    "Sci-Fi": "genre_Sci-Fi",
+    "Support": "genre_Support",
+    "Thriller": "genre_Thriller",
+    "War": "genre_War",
+    "Western": "genre_Western"
+}
 
 
 class Recommender:
@@ -43,7 +92,9 @@ class Recommender:
 
     Instance attributes:
             - self.root: The root window of the application.
-            - self.graph: A graph representation of movie-actor relationships.
+            - self.recorder: A load_harness.TraceRecorder that records every search as a session trace, or None.
+            - self.index: The handle to the current movie index (graph and decision tree), which can be
+              reloaded in the background while searches are running.
             - self.title_font: Font used for titles.
             - self.button_font: Font used for buttons.
             - self.welcome_frame: Frame for the welcome screen.
@@ -55,6 +106,8 @@ class Recommender:
             - actor_entry: Entry widget for actor name input.
             - length_var: Variable to store selected movie length.
             - genre_listbox: Listbox for genre selection.
+            - genre_options: The genre of each genre_listbox row, whose text also shows its match count.
+            - length_menu: Menu of the runtime dropdown, whose entries also show their match count.
     """
 
     root: Any
@@ -63,24 +116,28 @@ class Recommender:
     welcome_frame: tk.Frame
     actor_frame: tk.Frame
     recommendation_frame: tk.Frame
-    graph: Graph
+    recorder: Optional[Any]
+    index: IndexHandle
     colour_blue: str
     colour_dark: str
     colour_light: str
     actor_entry: tk.Entry
     length_var: tk.StringVar
     genre_listbox: tk.Listbox
+    genre_options: list[str]
+    length_menu: tk.Menu
 
-    def __init__(self, root: Any) -> None:
+    def __init__(self, root: Any, recorder: Optional[Any] = None) -> None:
         # Initialize the main window and main variables
         self.root = root
+        self.recorder = recorder
         self.root.title("PickMeWatchMe")
         self.root.geometry("800x600")
         self.root.configure(bg="#002138")
 
         # Initialize recommendation functionality components
-        # self.tree = Binary_Csv('imdb_top_1000.csv', 'decision_tree.csv').create_decision_csv()
-        self.graph = load_movie_actor_graph("imdb_top_1000.csv")
+        self.index = IndexHandle(open_movie_index('imdb_top_1000.csv', 'decision_tree.csv',
+                                                  'decision_tree.snapshot'))
 
         # Custom fonts
         self.title_font = tkfont.Font(family="Helvetica", size=24, weight="bold")
@@ -103,6 +160,8 @@ class Recommender:
         self.actor_entry = None
         self.length_var = None
         self.genre_listbox = None
+        self.genre_options = []
+        self.length_menu = None
 
     def extract_title(self, movie: Movie) -> str:
         """
@@ -178,11 +237,14 @@ class Recommender:
         """
         actor_name = self.actor_entry.get()  # gets the inputted actor's name
         if actor_name:
-            if actor_name not in self.graph.get_vertices('actor'):
+            if self.recorder is not None:
+                self.recorder.record_actor(actor_name)
+            with self.index.reader() as index:
+                movies = search_actor(index, actor_name)
+            if movies is None:
                 messagebox.showinfo("Sorry", f"{actor_name} is not in our Database")
                 return
 
-            movies = self.graph.get_neighbours(actor_name)
             if movies:
                 self.show_movie_list(movies, f"Movies featuring {actor_name}")
             else:
@@ -221,6 +283,7 @@ class Recommender:
                                highlightthickness=0)
         length_dropdown["menu"].config(font=self.button_font, bg=self.colour_light, fg=self.colour_dark)
         length_dropdown.pack(side=tk.LEFT)
+        self.length_menu = length_dropdown["menu"]
 
         # Genre multiple-selection Listbox
         genre_frame = tk.Frame(self.recommendation_frame, bg="#002138")
@@ -229,16 +292,16 @@ class Recommender:
         tk.Label(genre_frame, text="Select Genre(s):",
                  font=self.button_font, fg="white", bg="#002138").pack(side=tk.LEFT, padx=10)
 
-        genre_options = ["Action", "Adventure", "Animation", "Biography", "Comedy", "Crime",
-                         "Drama", "Family", "Fantasy", "Film-Noir", "History", "Horror",
-                         "Music", "Musical", "Mystery", "Romance", "Sci-Fi", "Support",
-                         "Thriller", "War", "Western"]
+        self.genre_options = ["Action", "Adventure", "Animation", "Biography", "Comedy", "Crime",
+                              "Drama", "Family", "Fantasy", "Film-Noir", "History", "Horror",
+                              "Music", "Musical", "Mystery", "Romance", "Sci-Fi", "Support",
+                              "Thriller", "War", "Western"]
 
         self.genre_listbox = tk.Listbox(genre_frame, selectmode="multiple",
                                         font=self.button_font, bg=self.colour_light,
                                         fg=self.colour_dark, height=10)
 
-        for genre in genre_options:
+        for genre in self.genre_options:
             self.genre_listbox.insert(tk.END, genre)
 
         scrollbar = tk.Scrollbar(genre_frame)
@@ -249,6 +312,11 @@ class Recommender:
 
         self.genre_listbox.pack(side=tk.LEFT)
 
+        # show how many movies each option would match, and update the counts as the selection changes
+        self.genre_listbox.bind("<<ListboxSelect>>", lambda _event: self.refresh_facets())
+        self.length_var.trace_add("write", lambda *_args: self.refresh_facets())
+        self.refresh_facets()
+
         # Submit button
         submit_btn = tk.Button(self.recommendation_frame, text="Submit",
                                command=self.process_preferences,  # call processing function
@@ -257,6 +325,31 @@ class Recommender:
                                borderwidth=0, highlightthickness=0)
         submit_btn.pack(pady=20)
 
+    def refresh_facets(self) -> None:
+        """
+        Show next to every runtime and genre option how many movies the search would find if that option were
+        chosen next, and grey out the options that would find none.
+        """
+        selected_indices = self.genre_listbox.curselection()
+        genres = [self.genre_options[i] for i in selected_indices]
+        with self.index.reader() as index:
+            lengths, genre_counts = preference_facets(index, self.length_var.get(), genres)
+
+        for i, option in enumerate(lengths):
+            colour = self.colour_dark if lengths[option] > 0 else "grey"
+            self.length_menu.entryconfig(i, label=f"{option} ({lengths[option]})", foreground=colour)
+
+        # rewriting a row's text clears its selection, so restore it afterwards
+        top = self.genre_listbox.yview()[0]
+        self.genre_listbox.delete(0, tk.END)
+        for genre in self.genre_options:
+            self.genre_listbox.insert(tk.END, f"{genre} ({genre_counts[genre]})")
+            colour = self.colour_dark if genre_counts[genre] > 0 else "grey"
+            self.genre_listbox.itemconfig(tk.END, fg=colour, selectforeground=colour)
+        for i in selected_indices:
+            self.genre_listbox.selection_set(i)
+        self.genre_listbox.yview_moveto(top)
+
     def process_preferences(self) -> None:
         """
         Process user preferences and display movie recommendations.
@@ -264,52 +357,20 @@ class Recommender:
         This method takes the selected runtime and genres, processes them through a decision tree,
         and displays the resulting movie recommendations.
         """
-        length_map = {
-            "0-60 minutes": "runtime_bin_very-short",
-            "60-90 minutes": "runtime_bin_short",
-            "90-120 minutes": "runtime_bin_mid",
-            "120-180 minutes": "runtime_bin_mid-long",
-            "180-240 minutes": "runtime_bin_long",
-            "240+ minutes": "runtime_bin_very-long"
-        }
-        genre_map = {
-            "Action": "genre_Action",
-            "Animation": "genre_Animation",
-            "Adventure": "genre_Adventure",
-            "Biography": "genre_Biography",
-            "Comedy": "genre_Comedy",
-            "Crime": "genre_Crime",
-            "Drama": "genre_Drama",
-            "Family": "genre_Family",
-            "Fantasy": "genre_Fantasy",
-            "Film-Noir": "genre_Film-Noir",
-            "History": "genre_History",
-            "Horror": "genre_Horror",
-            "Music": "genre_Music",
-            "Musical": "genre_Musical",
-            "Mystery": "genre_Mystery",
-            "Romance": "genre_Romance",
-            "Sci-Fi": "genre_Sci-Fi",
-            "Support": "genre_Support",
-            "Thriller": "genre_Thriller",
-            "War": "genre_War",
-            "Western": "genre_Western"
-        }
-
-        length = {length_map[self.length_var.get()]}
         selected_indices = self.genre_listbox.curselection()
-        genres = {genre_map[self.genre_listbox.get(i)] for i in selected_indices}
-        encoded_input = length.union(genres)
-
-        # call the encoding and tree traversal functions
-        BinaryCSV('imdb_top_1000.csv', 'decision_tree.csv').create_decision_csv()
-        decision_tree = build_decision_tree('decision_tree.csv')  # create decision tree
-        encoded = convert_user_input(encoded_input, 'decision_tree.csv')
-        recommended_movies = get_rec(decision_tree, encoded)  # get movie recommendations
-        if recommended_movies == 'Not Found':
+        genres = [self.genre_options[i] for i in selected_indices]
+        if self.recorder is not None:
+            self.recorder.record_preferences(self.length_var.get(), genres)
+
+        # the index is shared with any reload in progress, so hold it for the whole search
+        with self.index.reader() as index:
+            recommended_movies, exact = recommend_movies(index, self.length_var.get(), genres)
+        if not recommended_movies:
             messagebox.showinfo("No Recommendations", "No movie recommendations found for your preferences.")
-        elif recommended_movies:
+        elif exact:
             self.show_movie_list(recommended_movies, "Movie Recommendations")
+        else:
+            self.show_movie_list(recommended_movies, "Closest Matches")
 
     def show_movie_list(self, movies: list, title: str) -> None:
         """
@@ -350,49 +411,371 @@ class Recommender:
         scrollbar.pack(side="right", fill="y")
 
 
+def build_movie_index(movie_file: str, decision_file: str, version: int = 0, criterion: str = 'gain',
+                      memory_budget: Optional[int] = None, mode: str = 'downgrade') -> MovieIndex:
+    """
+    Build every data structure used to answer searches from the given movie dataset and return them as an
+    immutable MovieIndex with the given version. The decision csv is regenerated from movie_file first.
+
+    If memory_budget is given, it is the total in bytes for the whole index. Each build is checked before it
+    starts, with memory.check_budget, against what is left of the budget after the builds kept before it: with
+    mode 'refuse' a MemoryError is raised for the first one that does not fit, and with mode 'downgrade' the
+    compact alternative is used instead. In order:
+    - regenerating the decision csv loads every movie with MovieData.load_movie_basics, which are freed once
+      the csv is written; if they do not fit, the existing decision csv is kept if it is newer than movie_file
+      (otherwise a MemoryError is raised, since there is nothing to downgrade to)
+    - the signature index (see estimate_signature_bytes) has no compact alternative, so a MemoryError is
+      raised if it does not fit, whatever the mode
+    - the graph is loaded with snapshot.load_graph_within_budget, which downgrades to an EngineSnapshot written
+      next to the decision csv; the bytes the loaded graph or snapshot uses are taken off the budget
+    - if the decision tree does not fit, the index has no tree and preference searches use the signature
+      index, which finds the same exact matches
+
+    Preconditions:
+        - mode in {'refuse', 'downgrade'}
+    """
+    if memory_budget is None or check_budget(MovieData.estimate_movie_basics_bytes(movie_file), memory_budget,
+                                             mode):
+        BinaryCSV(movie_file, decision_file).create_decision_csv()
+    elif not os.path.exists(decision_file) or os.path.getmtime(decision_file) < os.path.getmtime(movie_file):
+        raise MemoryError(f'no up to date {decision_file}, and regenerating it does not fit the memory budget')
+    feature_names = list(decision_vocabulary(decision_file))
+
+    remaining = memory_budget
+    if memory_budget is not None:
+        signature_bytes = estimate_signature_bytes(decision_file)
+        check_budget(signature_bytes, remaining, 'refuse')
+        remaining -= signature_bytes
+    movies, matrix = read_decision_csv(decision_file)
+
+    if memory_budget is None:
+        graph = load_movie_actor_graph(movie_file)
+    else:
+        snapshot_file = os.path.splitext(decision_file)[0] + '.snapshot'
+        graph = load_graph_within_budget(movie_file, decision_file, snapshot_file, remaining, mode)
+        remaining -= graph.memory_report()['total']
+
+    tree = None
+    if memory_budget is None or check_budget(tree_bytes(matrix, criterion), remaining, mode):
+        tree = tree_from_features(movies, matrix, criterion)
+    return MovieIndex(version, graph, tree, MovieSignatureIndex(movies, matrix.tolist()), feature_names)
+
+
+def build_movie_index_from_snapshot(snapshot: EngineSnapshot, version: int = 0,
+                                    criterion: str = 'gain') -> MovieIndex:
+    """
+    Return a MovieIndex with the given version built from the given EngineSnapshot instead of the csv files:
+    the snapshot is the graph, and the decision tree and signature index are built from its feature matrix and
+    Movie fields. The index answers every search the same way as the one build_movie_index builds from the
+    csv files the snapshot was written from.
+
+    Preconditions:
+        - criterion in {'csv', 'entropy', 'gain'}
+    """
+    movies = snapshot.movies()
+    matrix = np.asarray(snapshot.features)
+    return MovieIndex(version, snapshot, tree_from_features(movies, matrix, criterion),
+                      MovieSignatureIndex(movies, matrix.tolist()), list(snapshot.feature_names))
+
+
+def open_movie_index(movie_file: str, decision_file: str, snapshot_file: str, version: int = 0,
+                     criterion: str = 'gain') -> MovieIndex:
+    """
+    Return a MovieIndex with the given version for the given movie dataset, built from snapshot_file if it is
+    up to date with movie_file (see snapshot.open_snapshot), so neither csv file is parsed. Otherwise the index
+    is built with build_movie_index and snapshot_file is rewritten for the next launch.
+
+    Preconditions:
+        - criterion in {'csv', 'entropy', 'gain'}
+    """
+    try:
+        snapshot = open_snapshot(snapshot_file, movie_file)
+    except (OSError, ValueError):
+        index = build_movie_index(movie_file, decision_file, version, criterion)
+        write_snapshot(movie_file, decision_file, snapshot_file, index.graph)
+        return index
+    return build_movie_index_from_snapshot(snapshot, version, criterion)
+
+
+def search_actor(index: MovieIndex, actor_name: str) -> Optional[set]:
+    """
+    Return the titles of the movies featuring the given actor, or None if the actor is not in the index.
+    Helper to handle_actor_search.
+    """
+    if not index.graph.has_vertex(actor_name, 'actor'):
+        return None
+    return index.graph.get_neighbours(actor_name, 'movie', 'actor')
+
+
+def recommend_movies(index: MovieIndex, length: str, genres: list[str]) -> tuple[list, bool]:
+    """
+    Return the recommended films for the given runtime option (a key of LENGTH_MAP) and genre options (keys of
+    GENRE_MAP), and whether they match exactly. If the tree has no exact match, the closest films are returned
+    instead. Helper to process_preferences.
+    """
+    encoded_input = {LENGTH_MAP[length]} | {GENRE_MAP[genre] for genre in genres}
+    tree_input = index.encode(encoded_input)
+    if index.tree is None:
+        # built without a tree to fit a memory budget: the signature index has the same exact matches
+        ids = index.signatures.match_batch(np.array([tree_input], dtype=np.uint8))[0]
+        recommended_movies = [index.signatures.movies[i] for i in ids] if len(ids) > 0 else 'Not Found'
+    else:
+        recommended_movies = get_rec(index.tree, tree_input)  # get movie recommendations
+    if recommended_movies != 'Not Found':
+        return recommended_movies, True
+    # no exact match, so fall back to the movies closest to the selected preferences
+    return get_nearest_rec(index.signatures, tree_input), False
+
+
+def recommend_batch(index: MovieIndex, preferences: list[tuple[str, list[str]]], exact: bool = True) -> list:
+    """
+    Return, for each (runtime option, genre options) pair in preferences, the ids of the films matching it
+    as a numpy array (positions in index.signatures.movies, in decision csv order). All the preferences are
+    encoded into one matrix and matched in one pass, so this is meant for scoring many profiles at a time.
+
+    With exact, a film matches only if it has exactly the selected runtime and genres, like recommend_movies
+    when it finds an exact match; otherwise it matches if it has at least them.
+    """
+    column_sets = [{LENGTH_MAP[length]} | {GENRE_MAP[genre] for genre in genres} for length, genres in preferences]
+    return index.signatures.match_batch(index.encode_batch(column_sets), exact)
+
+
+def preference_facets(index: MovieIndex, length: Optional[str], genres: list[str],
+                      exact: bool = True) -> tuple[dict[str, int], dict[str, int]]:
+    """
+    Return how many movies match each runtime option and each genre option, given the current partial selection
+    of a runtime option (a key of LENGTH_MAP, or None) and genre options (keys of GENRE_MAP).
+
+    A runtime option's count is for switching the runtime to that option, keeping the selected genres. A genre
+    option's count is for adding that genre to the selection (or, if it is already selected, for the selection
+    as it is); genres that are not decision csv columns are ignored by the search, so they get the count of the
+    selection as it is. With exact, a movie matches only if it has exactly the selected runtime and genres, like the
+    decision tree; otherwise it matches if it has at least them. Helper to refresh_facets.
+    """
+    columns = {name: i for i, name in enumerate(index.feature_names)}
+    selected_genres = {GENRE_MAP[genre] for genre in genres}
+    genre_query = index.encode(selected_genres)
+    runtime_counts = index.signatures.facet_counts(genre_query, exact)
+    if length is not None:
+        genre_query = index.encode(selected_genres | {LENGTH_MAP[length]})
+    genre_counts = index.signatures.facet_counts(genre_query, exact)
+    unchanged = index.signatures.count(genre_query, exact)
+
+    lengths = {option: int(runtime_counts[columns[column]]) if column in columns else 0
+               for option, column in LENGTH_MAP.items()}
+    genre_facets = {option: int(genre_counts[columns[column]]) if column in columns else unchanged
+                    for option, column in GENRE_MAP.items()}
+    return lengths, genre_facets
+
+
+# Maps each decision csv file to its modification time and the position of each of its feature columns,
+# so that encoding a query only reads the header again when the file has been regenerated
+_VOCABULARIES = {}
+
+
+def decision_vocabulary(file: str) -> dict[str, int]:
+    """
+    Return a dictionary mapping each feature column of the given decision csv file to its position in an
+    encoded input. Only the header line is read, and only again once the file has changed.
+    """
+    modified = os.stat(file).st_mtime_ns
+    if file not in _VOCABULARIES or _VOCABULARIES[file][0] != modified:
+        with open(file) as csv_file:
+            header = next(csv.reader(csv_file))
+        # header[0] is the movie node
+        _VOCABULARIES[file] = (modified, {name: i for i, name in enumerate(header[1:])})
+    return _VOCABULARIES[file][1]
+
+
 def convert_user_input(_input: set, file: str) -> list:
     """
     Encode the user input into a binary list so that it can traversre through the list.
+    The encoding is in decision csv order; a tree that splits in another order permutes it itself.
     Helper to process_preferences.
     """
-    with open(file) as csv_file:
-        reader = csv.reader(csv_file)
-        rows = list(reader)
-        header = rows[0]
-
-        encoded = []
-        # starts at one because header[0] is the movie node
-        header_index = 1
-        while header_index < len(header):
-            if header[header_index] in _input:
-                encoded.append(1)
-            else:
-                encoded.append(0)
-            header_index += 1
+    return convert_user_inputs([_input], file)[0].tolist()
 
-        return encoded
+
+def convert_user_inputs(inputs: list[set], file: str) -> np.ndarray:
+    """
+    Encode many user inputs at once into the rows of an N x F binary matrix, with row i equal to
+    convert_user_input(inputs[i], file).
+    """
+    return encode_batch(decision_vocabulary(file), inputs)
 
 
 def get_rec(tree: MovieDecisionTree, _input: list) -> list:
     """
-    Return the recommended films by traversing the given tree. Helper to process_preferences.
+    Return the recommended films by traversing the given tree with the given encoded input, in decision csv
+    order as returned by convert_user_input. Helper to process_preferences.
     """
     recommendations = tree.traverse_tree(_input)
     return recommendations
 
 
-def build_decision_tree(file: str) -> MovieDecisionTree:
+def get_nearest_rec(index: MovieSignatureIndex, _input: list, k: int = 20, max_distance: int = 3) -> list:
     """
-    Build the decision tree using the given file and returns a MovieDecisionTree object process_preferences.
+    Return up to k films whose signature is within max_distance bits of the given encoded input, closest first.
+    Fallback for process_preferences when get_rec finds no exact match.
     """
-    tree = MovieDecisionTree('', [])
+    return [movie for movie, _ in index.nearest(_input, k, max_distance)]
+
+
+def read_decision_csv(file: str) -> tuple[list[Movie], np.ndarray]:
+    """
+    Return the Movie of every row of the given decision csv file, and the features of every row as an N x F
+    binary matrix.
+    """
+    movies = []
+    rows = []
     with open(file) as csv_file:
         reader = csv.reader(csv_file)
-        next(reader)
+        num_features = len(next(reader)) - 1
         for row in reader:
-            movie = pickle.loads(eval(row[0]))
-            movie_list = row[1:] + [movie]
-            tree.create_branch(movie_list)
+            movies.append(pickle.loads(eval(row[0])))
+            rows.append([int(bit) for bit in row[1:]])
+    return movies, np.array(rows, dtype=np.uint8).reshape(len(rows), num_features)
+
+
+def build_signature_index(file: str) -> MovieSignatureIndex:
+    """
+    Build the packed signature index using the given decision csv file and return a MovieSignatureIndex object.
+    """
+    movies, matrix = read_decision_csv(file)
+    return MovieSignatureIndex(movies, matrix.tolist())
+
+
+def split_order(file: str, criterion: str = 'entropy') -> list[int]:
+    """
+    Return the order in which the decision tree should split on the features of the given decision csv file,
+    as a list of feature indexes (0 is the first column after the movie node). See order_features.
+
+    Preconditions:
+        - criterion in {'csv', 'entropy', 'gain'}
+    """
+    return order_features(read_decision_csv(file)[1], criterion)
+
+
+def order_features(matrix: np.ndarray, criterion: str = 'entropy') -> list[int]:
+    """
+    Return the order in which the decision tree should split on the features of the given N x F binary
+    feature matrix (one row per movie), as a list of feature indexes.
+
+    The criterion is one of:
+    - 'csv': the header order (all runtime bins, then the genres alphabetically)
+    - 'entropy': lowest entropy first, so that the rarest and most common features, which split the fewest
+      movies apart, are near the root and the branching happens as deep as possible
+    - 'gain': greedily pick the feature with the lowest information gain given the features already chosen,
+      which accounts for correlated features (e.g. each movie has exactly one runtime bin)
+
+    Since every movie has its own leaf, a feature's information gain about the movie is its (conditional)
+    entropy, and both orders shrink the tree compared to 'csv'.
+
+    Preconditions:
+        - criterion in {'csv', 'entropy', 'gain'}
+    """
+    num_features = matrix.shape[1]
+    if criterion == 'csv' or len(matrix) == 0:
+        return list(range(num_features))
+    elif criterion == 'entropy':
+        return [int(i) for i in np.argsort(_entropy(matrix.mean(axis=0)), kind='stable')]
+
+    order = []
+    remaining = list(range(num_features))
+    # group id of each movie: movies with the same values for the chosen features share a group
+    groups = np.zeros(len(matrix), dtype=np.int64)
+    while remaining:
+        gains = []
+        for feature in remaining:
+            # conditional entropy of the feature given the groups, weighted by group size
+            ones = np.bincount(groups, weights=matrix[:, feature])
+            sizes = np.bincount(groups)
+            nonempty = sizes > 0
+            gains.append(float(np.sum(sizes[nonempty] * _entropy(ones[nonempty] / sizes[nonempty]))))
+        best = remaining.pop(int(np.argmin(gains)))
+        order.append(best)
+        groups = np.unique(groups * 2 + matrix[:, best], return_inverse=True)[1]
+    return order
+
+
+def _entropy(p: np.ndarray) -> np.ndarray:
+    """
+    Return the binary entropy (in bits) of each probability in the given array.
+    """
+    p = np.clip(p, 0.0, 1.0)
+    safe_p = np.where(p > 0, p, 1.0)
+    safe_q = np.where(p < 1, 1.0 - p, 1.0)
+    return -(p * np.log2(safe_p) + (1.0 - p) * np.log2(safe_q))
+
+
+def estimate_signature_bytes(file: str) -> int:
+    """
+    Return an estimate of the bytes build_signature_index(file) would use, from a count of the rows of the
+    given decision csv file. The estimate includes the Movie of every row, which the decision tree shares.
+    """
+    with open(file) as csv_file:
+        rows = sum(1 for _ in csv_file) - 1
+    return max(rows, 0) * SIGNATURE_MOVIE_BYTES
+
+
+def estimate_tree_bytes(file: str, criterion: str = 'csv') -> int:
+    """
+    Return an estimate of the bytes build_decision_tree(file, criterion) would use. The number of nodes is
+    counted exactly from the decision csv (one node per distinct prefix of the rows in split order, plus the
+    root and a leaf per movie) without building the tree. The Movie objects the leaves hold are counted by
+    estimate_signature_bytes instead, since build_movie_index shares them with the signature index.
+
+    Preconditions:
+        - criterion in {'csv', 'entropy', 'gain'}
+    """
+    return tree_bytes(read_decision_csv(file)[1], criterion)
+
+
+def tree_bytes(matrix: np.ndarray, criterion: str = 'csv') -> int:
+    """
+    Return an estimate of the bytes tree_from_features would use for the given N x F binary feature matrix,
+    as described in estimate_tree_bytes.
+
+    Preconditions:
+        - criterion in {'csv', 'entropy', 'gain'}
+    """
+    if len(matrix) == 0:
+        return TREE_NODE_BYTES
+    order = order_features(matrix, criterion)
+
+    nodes = 1
+    # group id of each movie: movies with the same prefix share a group, and so a node
+    groups = np.zeros(len(matrix), dtype=np.int64)
+    for feature in order:
+        groups = np.unique(groups * 2 + matrix[:, feature], return_inverse=True)[1]
+        nodes += int(groups.max()) + 1
+    return nodes * TREE_NODE_BYTES + len(matrix) * TREE_LEAF_BYTES
+
+
+def build_decision_tree(file: str, criterion: str = 'csv') -> MovieDecisionTree:
+    """
+    Build the decision tree using the given file and returns a MovieDecisionTree object process_preferences.
+
+    The tree splits on the features in the order given by split_order(file, criterion). The order is stored
+    in the returned tree's feature_order, and the tree permutes the csv order encodings it is queried with.
+    """
+    movies, matrix = read_decision_csv(file)
+    return tree_from_features(movies, matrix, criterion)
+
+
+def tree_from_features(movies: list[Movie], matrix: np.ndarray, criterion: str = 'csv') -> MovieDecisionTree:
+    """
+    Return the decision tree of the given movies, where row i of the N x F binary matrix holds the features
+    of movies[i], splitting on the features in the order given by order_features(matrix, criterion).
+
+    Preconditions:
+        - len(movies) == len(matrix)
+        - criterion in {'csv', 'entropy', 'gain'}
+    """
+    order = order_features(matrix, criterion)
+    tree = MovieDecisionTree('', [], None if criterion == 'csv' else order)
+    for movie, row in zip(movies, matrix.tolist()):
+        tree.create_branch([str(row[i]) for i in order] + [movie])
     return tree
 
 
@@ -406,8 +789,11 @@ if __name__ == '__main__':
     doctest.testmod(verbose='TRUE')
 
     python_ta.check_all(config={
-        'extra-imports': ['tkinter', 'tkinter.font', 'tree', '__future__',
-                          'movie_actor_graph', 'tree', 'csv', 'pickle', 'tree', 'ast'],
-        'allowed-io': ['build_decision_tree', 'load_movie_data', 'encode_user_input', 'convert_user_input'],
+        'extra-imports': ['tkinter', 'tkinter.font', 'tree', '__future__', 'live_index',
+                          'movie_actor_graph', 'tree', 'csv', 'pickle', 'tree', 'ast', 'numpy', 'typing', 'os',
+                          'movie_data', 'memory', 'snapshot'],
+        'allowed-io': ['build_decision_tree', 'build_movie_index', 'split_order', 'build_signature_index',
+                       'load_movie_data', 'encode_user_input', 'decision_vocabulary', 'estimate_tree_bytes',
+                       'estimate_signature_bytes', 'read_decision_csv'],
         'max-line-length': 120
     })
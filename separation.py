@@ -0,0 +1,260 @@
+"""
+Module Description
+==================
+This module contains the ActorConnections class, which answers "degrees of separation" queries over the
+movie-actor graph: the shortest chain of actor - movie - actor - ... - actor linking two actors.
+
+The graph is stored as an integer adjacency (compressed sparse rows: an offsets array plus a flat array of
+neighbour ids), built either from a Graph or directly from the adjacency sections of an EngineSnapshot.
+Connected components are labelled once when the index is built, so a pair of actors in different components
+is rejected without searching. A shortest path is found with a bidirectional breadth-first search that
+expands the smaller of the two frontiers one level at a time; each level is expanded as a whole with numpy,
+so the work per level is a handful of array operations rather than a Python loop over vertices.
+
+The degrees of separation of two actors is the number of movies on the shortest chain between them.
+
+Copyright and Usage Information
+===============================
+
+This file is solely for the personal and private use of
+Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited.
+
+This file is Copyright (c) 2025 Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang
+"""
+from __future__ import annotations
+from typing import Optional
+import numpy as np
+from movie_actor_graph import Graph, load_movie_actor_graph
+from snapshot import EngineSnapshot
+
+
+def _expand(offsets: np.ndarray, ids: np.ndarray, frontier: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return (neighbours, sources) for every edge leaving the given frontier: neighbours[i] is adjacent to
+    sources[i].
+    """
+    starts = offsets[frontier]
+    lengths = offsets[frontier + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=ids.dtype), np.empty(0, dtype=frontier.dtype)
+    # position of each edge within its source's slice, added to the slice's start
+    steps = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return ids[np.repeat(starts, lengths) + steps], np.repeat(frontier, lengths)
+
+
+def _visit(neighbours: np.ndarray, sources: np.ndarray, parent: np.ndarray) -> np.ndarray:
+    """Record a parent for each neighbour that has not been visited yet, and return those neighbours
+    (without duplicates) as the next frontier.
+    """
+    fresh = parent[neighbours] == -1
+    new, first = np.unique(neighbours[fresh], return_index=True)
+    parent[new] = sources[fresh][first]
+    return new
+
+
+class ActorConnections:
+    """An index over the movie-actor graph for shortest-path ("degrees of separation") queries between actors.
+
+    Instance Attributes:
+        - items: the item (title or actor name) of each vertex, indexed by vertex id
+        - num_components: the number of connected components of the graph
+
+    Representation Invariants:
+        - len(self.items) == len(self._offsets) - 1 == len(self._components)
+    """
+    items: list[str]
+    num_components: int
+    # Private Instance Attributes:
+    #     - _ids: maps each item to its vertex id
+    #     - _actors: whether each vertex is an actor, indexed by vertex id
+    #     - _offsets: the neighbours of vertex v are _neighbours[_offsets[v]:_offsets[v + 1]]
+    #     - _neighbours: the neighbour ids of every vertex, concatenated
+    #     - _components: the connected component label of each vertex
+    _ids: dict[str, int]
+    _actors: np.ndarray
+    _offsets: np.ndarray
+    _neighbours: np.ndarray
+    _components: np.ndarray
+
+    def __init__(self, items: list[str], actors: np.ndarray, offsets: np.ndarray, neighbours: np.ndarray) -> None:
+        """Initialize the index from a numbered adjacency and label its connected components.
+
+        Preconditions:
+            - len(items) == len(actors) == len(offsets) - 1
+            - the adjacency is symmetric: v is a neighbour of u exactly when u is a neighbour of v
+        """
+        self.items = items
+        self._ids = {item: i for i, item in enumerate(items)}
+        self._actors = actors
+        self._offsets = offsets
+        self._neighbours = neighbours
+        self._components = np.full(len(items), -1, dtype=np.int32)
+        self.num_components = 0
+        for start in range(len(items)):
+            if self._components[start] == -1:
+                self._label_component(start, self.num_components)
+                self.num_components += 1
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> ActorConnections:
+        """Return an index over the movie and actor vertices of the given graph."""
+        items, kinds, neighbours = graph.to_adjacency({'movie', 'actor'})
+        offsets = np.zeros(len(items) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(lst) for lst in neighbours])
+        flat = np.array([v for lst in neighbours for v in lst], dtype=np.int32)
+        return cls(items, np.array([kind == 'actor' for kind in kinds], dtype=bool), offsets, flat)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: EngineSnapshot) -> ActorConnections:
+        """Return an index over the graph in the given snapshot, built from its adjacency arrays without
+        creating a vertex object per movie or actor. Movies get vertex ids 0 to m - 1 and actors m onwards.
+        """
+        num_movies = snapshot.num_movies()
+        items = [snapshot.title(i) for i in range(num_movies)]
+        items.extend(snapshot.actor(i) for i in range(snapshot.num_actors()))
+        cast_offsets, cast_ids = snapshot.cast_arrays()
+        film_offsets, film_ids = snapshot.filmography_arrays()
+        offsets = np.concatenate([cast_offsets, film_offsets[1:] + cast_offsets[-1]])
+        neighbours = np.concatenate([cast_ids.astype(np.int32) + num_movies, film_ids.astype(np.int32)])
+        actors = np.arange(len(items)) >= num_movies
+        return cls(items, actors, offsets, neighbours)
+
+    def _label_component(self, start: int, label: int) -> None:
+        """Give every vertex reachable from start the given component label."""
+        self._components[start] = label
+        frontier = np.array([start], dtype=np.int64)
+        while len(frontier) > 0:
+            neighbours, _ = _expand(self._offsets, self._neighbours, frontier)
+            new = np.unique(neighbours[self._components[neighbours] == -1])
+            self._components[new] = label
+            frontier = new.astype(np.int64)
+
+    def _vertex(self, actor: str) -> int:
+        """Return the vertex id of the given actor. Raise a ValueError if actor is not an actor in this index."""
+        if actor not in self._ids or not self._actors[self._ids[actor]]:
+            raise ValueError(f'{actor} is not an actor in this graph')
+        return self._ids[actor]
+
+    def connected(self, actor1: str, actor2: str) -> bool:
+        """Return whether there is any chain of movies linking the two actors, in constant time.
+
+        Raise a ValueError if either actor is not in this index.
+        """
+        return bool(self._components[self._vertex(actor1)] == self._components[self._vertex(actor2)])
+
+    def path(self, actor1: str, actor2: str) -> Optional[list[str]]:
+        """Return a shortest chain [actor1, movie, actor, movie, ..., actor2] linking the two actors, or None if
+        they are not connected.
+
+        Raise a ValueError if either actor is not in this index.
+
+        >>> connections = ActorConnections.from_graph(load_movie_actor_graph("movie_data_small.csv"))
+        >>> connections.path('Marlon Brando', 'Robert De Niro')
+        ['Marlon Brando', 'The Godfather', 'Al Pacino', 'The Godfather: Part II', 'Robert De Niro']
+        >>> connections.path('Tim Robbins', 'Al Pacino') is None
+        True
+        """
+        source, target = self._vertex(actor1), self._vertex(actor2)
+        if source == target:
+            return [actor1]
+        if self._components[source] != self._components[target]:
+            return None
+
+        parents = (np.full(len(self.items), -1, dtype=np.int64), np.full(len(self.items), -1, dtype=np.int64))
+        parents[0][source] = source
+        parents[1][target] = target
+        frontiers = [np.array([source], dtype=np.int64), np.array([target], dtype=np.int64)]
+        while True:
+            # expand the smaller frontier, since its next level is the cheaper one to compute
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            neighbours, sources = _expand(self._offsets, self._neighbours, frontiers[side])
+            frontiers[side] = _visit(neighbours, sources, parents[side])
+            met = frontiers[side][parents[1 - side][frontiers[side]] != -1]
+            if len(met) > 0:
+                return self._join(parents, int(met[0]))
+
+    def _join(self, parents: tuple[np.ndarray, np.ndarray], meeting: int) -> list[str]:
+        """Return the chain from the source to the target of a bidirectional search that met at meeting."""
+        forward = [meeting]
+        while parents[0][forward[-1]] != forward[-1]:
+            forward.append(int(parents[0][forward[-1]]))
+        backward = []
+        vertex = meeting
+        while parents[1][vertex] != vertex:
+            vertex = int(parents[1][vertex])
+            backward.append(vertex)
+        return [self.items[v] for v in forward[::-1] + backward]
+
+    def degrees(self, actor1: str, actor2: str) -> Optional[int]:
+        """Return the number of movies on a shortest chain linking the two actors, or None if they are not
+        connected. Raise a ValueError if either actor is not in this index.
+        """
+        chain = self.path(actor1, actor2)
+        if chain is None:
+            return None
+        return len(chain) // 2
+
+    def _search_from(self, actor: str) -> tuple[np.ndarray, np.ndarray]:
+        """Return the (distance, parent) arrays of a breadth-first search from the given actor over every
+        vertex, with -1 for the vertices it cannot reach.
+        """
+        source = self._vertex(actor)
+        distance = np.full(len(self.items), -1, dtype=np.int64)
+        parent = np.full(len(self.items), -1, dtype=np.int64)
+        distance[source] = 0
+        parent[source] = source
+        frontier = np.array([source], dtype=np.int64)
+        level = 0
+        while len(frontier) > 0:
+            level += 1
+            neighbours, sources = _expand(self._offsets, self._neighbours, frontier)
+            frontier = _visit(neighbours, sources, parent)
+            distance[frontier] = level
+        return distance, parent
+
+    def degrees_from(self, actor: str) -> dict[str, int]:
+        """Return a dictionary mapping every actor connected to the given actor (including themselves) to their
+        degrees of separation from it, computed with a single breadth-first search.
+
+        Raise a ValueError if actor is not in this index.
+        """
+        distance, _ = self._search_from(actor)
+        reached = np.flatnonzero((distance >= 0) & self._actors)
+        return {self.items[v]: int(distance[v]) // 2 for v in reached}
+
+    def paths_from(self, actor: str, targets: list[str]) -> dict[str, Optional[list[str]]]:
+        """Return a dictionary mapping each of the target actors to a shortest chain from the given actor to
+        them (or None if they are not connected), computed with a single breadth-first search.
+
+        Raise a ValueError if actor or any target is not in this index.
+        """
+        targets_ids = {target: self._vertex(target) for target in targets}
+        _, parent = self._search_from(actor)
+        paths = {}
+        for target, vertex in targets_ids.items():
+            if parent[vertex] == -1:
+                paths[target] = None
+            else:
+                chain = [vertex]
+                while parent[chain[-1]] != chain[-1]:
+                    chain.append(int(parent[chain[-1]]))
+                paths[target] = [self.items[v] for v in reversed(chain)]
+        return paths
+
+
+if __name__ == '__main__':
+
+    import python_ta.contracts
+    import doctest
+
+    python_ta.contracts.check_all_contracts()
+
+    doctest.testmod(verbose='TRUE')
+
+    python_ta.check_all(config={
+        'extra-imports': ['__future__', 'typing', 'numpy', 'movie_actor_graph', 'snapshot'],
+        'allowed-io': [],     # the names (strs) of functions that call print/open/input
+        'max-line-length': 120
+    })
@@ -0,0 +1,495 @@
+"""
+Module Description
+==================
+This module contains the write_snapshot function and the EngineSnapshot class, which save the data structures
+built from the movie dataset into a single file and open that file again without parsing any CSV.
+
+A snapshot file holds:
+- the string tables: movie titles, actor names and decision csv feature names
+- the poster link, runtime and rating of each movie, so its decision tree Movie can be rebuilt
+- the movie-actor graph adjacency, in both directions, as compressed sparse rows (an offsets array plus a
+  flat array of neighbour ids)
+- the one-hot feature matrix of the decision csv, one row per movie
+- the RangeIndex columns (values and sorted row ids) for the numeric filters
+
+The file starts with a magic string, the length of a JSON header and the header itself. The header carries the
+schema version, the size and modification time of each source file (checked whenever a snapshot is opened for
+given sources), a SHA-256 checksum of the source data (checked only when asked to verify, since it means reading
+the sources) and the offset, dtype and shape of every section. Each section is raw array data aligned to 64
+bytes, so opening a snapshot maps the file with mmap and wraps each section with np.frombuffer: nothing is
+copied or parsed, pages are only read when they are used, and several processes opening the same snapshot share
+the same physical pages through the operating system's page cache.
+
+Copyright and Usage Information
+===============================
+
+This file is solely for the personal and private use of
+Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited.
+
+This file is Copyright (c) 2025 Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang
+"""
+from __future__ import annotations
+import csv
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+from typing import Optional
+import numpy as np
+from movie_actor_graph import Graph, load_movie_actor_graph, estimate_graph_bytes
+from movie_data import MovieData
+from tree import Movie
+from memory import deep_size_report, check_budget
+from range_index import RangeIndex, COLUMNS, parse_number
+
+MAGIC = b'CINESNAP'
+SCHEMA_VERSION = 2
+ALIGNMENT = 64
+
+
+def source_checksum(*files: str) -> str:
+    """Return the SHA-256 hex digest of the contents of the given files, in order."""
+    digest = hashlib.sha256()
+    for file in files:
+        with open(file, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _string_table(strings: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Return the given strings as a (utf-8 bytes, offsets) pair, where string i is bytes[offsets[i]:offsets[i+1]].
+    """
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+def _csr(neighbours: list[list[int]]) -> tuple[np.ndarray, np.ndarray]:
+    """Return the given adjacency lists as an (offsets, ids) pair, where the neighbours of vertex i are
+    ids[offsets[i]:offsets[i+1]].
+    """
+    offsets = np.zeros(len(neighbours) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(lst) for lst in neighbours])
+    ids = np.array([i for lst in neighbours for i in lst], dtype=np.int32)
+    return offsets, ids
+
+
+def source_stats(file: str) -> list[int]:
+    """Return the [size in bytes, modification time in nanoseconds] of the given file, which a snapshot stores
+    for each of its sources to tell whether they have changed without reading them.
+    """
+    stat = os.stat(file)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def read_cast(movie_file: str) -> dict[str, set[str]]:
+    """Return a dictionary mapping each title in the given dataset to its cast: the edges load_movie_actor_graph
+    would create, without building the graph. As in MovieData.load_movie_basics, the last row with a title wins.
+    """
+    cast = {}
+    with open(movie_file, 'r', encoding='latin-1') as f:
+        for row in csv.DictReader(f, delimiter=","):
+            cast[row["Series_Title"]] = {row["Star1"], row["Star2"], row["Star3"], row["Star4"]}
+    return cast
+
+
+def write_snapshot(movie_file: str, decision_file: str, snapshot_file: str, graph: Optional[Graph] = None) -> None:
+    """Write a snapshot of the graph, feature matrix and range index built from the given movie dataset and
+    decision csv to snapshot_file. If graph is None, the adjacency is read from movie_file with read_cast, without
+    building a Graph.
+
+    Preconditions:
+        - movie_file is the path to a CSV file corresponding to the movie data
+        - decision_file is the decision csv created from movie_file by BinaryCSV.create_decision_csv
+    """
+    if graph is None:
+        cast = read_cast(movie_file)
+    else:
+        cast = {title: graph.get_neighbours(title, 'actor', 'movie') for title in graph.get_vertices('movie')}
+    titles = sorted(cast)
+    actors = sorted({actor for title in cast for actor in cast[title]})
+    movie_ids = {title: i for i, title in enumerate(titles)}
+    actor_ids = {actor: i for i, actor in enumerate(actors)}
+    filmography = [[] for _ in actors]
+    for title in titles:
+        for actor in cast[title]:
+            filmography[actor_ids[actor]].append(movie_ids[title])
+
+    sections = {}
+    sections['titles.bytes'], sections['titles.offsets'] = _string_table(titles)
+    sections['actors.bytes'], sections['actors.offsets'] = _string_table(actors)
+    sections['cast.offsets'], sections['cast.ids'] = _csr([sorted(actor_ids[a] for a in cast[t]) for t in titles])
+    sections['filmography.offsets'], sections['filmography.ids'] = _csr(filmography)
+
+    movie_fields = {'links': [''] * len(titles), 'durations': [''] * len(titles), 'ratings': [''] * len(titles)}
+    with open(decision_file) as csv_file:
+        reader = csv.reader(csv_file)
+        feature_names = next(reader)[1:]
+        features = np.zeros((len(titles), len(feature_names)), dtype=np.uint8)
+        for row in reader:
+            movie = pickle.loads(eval(row[0]))
+            if movie.title in movie_ids:
+                movie_id = movie_ids[movie.title]
+                features[movie_id] = [int(bit) for bit in row[1:]]
+                movie_fields['links'][movie_id] = str(movie.link)
+                movie_fields['durations'][movie_id] = str(movie.duration)
+                movie_fields['ratings'][movie_id] = str(movie.rating)
+    sections['features.names.bytes'], sections['features.names.offsets'] = _string_table(feature_names)
+    sections['features'] = features
+    for field, values in movie_fields.items():
+        sections[f'movies.{field}.bytes'], sections[f'movies.{field}.offsets'] = _string_table(values)
+
+    # range columns use the first row of each title, so that they line up with the movie ids of the graph
+    columns = {name: [np.nan] * len(titles) for name in COLUMNS}
+    seen = set()
+    with open(movie_file, 'r', encoding='latin-1') as f:
+        for row in csv.DictReader(f, delimiter=","):
+            title = row["Series_Title"]
+            if title in movie_ids and title not in seen:
+                seen.add(title)
+                for name, column in COLUMNS.items():
+                    columns[name][movie_ids[title]] = parse_number(row[column])
+    for name in COLUMNS:
+        values = np.array(columns[name], dtype=np.float64)
+        order = np.argsort(values, kind='stable')[:np.count_nonzero(~np.isnan(values))]
+        sections[f'range.{name}.values'] = values
+        sections[f'range.{name}.order'] = order.astype(np.int64)
+
+    header = {'schema_version': SCHEMA_VERSION,
+              'checksum': source_checksum(movie_file, decision_file),
+              'sources': {'movie': source_stats(movie_file), 'decision': source_stats(decision_file)},
+              'sections': {}}
+    # the header holds the section offsets, so grow the space reserved for it until the header fits
+    data_start = 0
+    header_bytes = b''
+    while len(MAGIC) + 4 + len(header_bytes) > data_start:
+        data_start += 4096
+        offset = data_start
+        for name, array in sections.items():
+            header['sections'][name] = {'offset': offset, 'dtype': array.dtype.str, 'shape': list(array.shape)}
+            offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+        header_bytes = json.dumps(header).encode('utf-8')
+
+    with open(snapshot_file, 'wb') as f:
+        f.write(MAGIC + struct.pack('<I', len(header_bytes)) + header_bytes)
+        for name, array in sections.items():
+            f.write(b'\0' * (header['sections'][name]['offset'] - f.tell()))
+            f.write(np.ascontiguousarray(array).tobytes())
+
+
+class EngineSnapshot:
+    """A read-only view of a snapshot file, memory-mapped so that no section is copied when it is opened.
+
+    Movies and actors are identified by their position in the sorted string tables.
+
+    Instance Attributes:
+        - schema_version: the schema version of the snapshot file
+        - checksum: the SHA-256 checksum of the source data the snapshot was built from
+        - sources: maps 'movie' and 'decision' to the [size, modification time] (see source_stats) of the
+          movie dataset and decision csv the snapshot was built from
+        - features: the one-hot feature matrix of the decision csv, one row per movie id
+        - feature_names: the decision csv column of each feature
+
+    Representation Invariants:
+        - self.schema_version == SCHEMA_VERSION
+    """
+    schema_version: int
+    checksum: str
+    sources: dict[str, list[int]]
+    features: np.ndarray
+    feature_names: list[str]
+    # Private Instance Attributes:
+    #     - _mmap: the memory map of the snapshot file, which every section array is a view of
+    #     - _sections: maps each section name to its array
+    #     - _movie_ids: maps each title to its movie id, built the first time a title is looked up
+    #     - _actor_ids: maps each actor to their actor id, built the first time an actor is looked up
+    _mmap: mmap.mmap
+    _sections: dict[str, np.ndarray]
+    _movie_ids: Optional[dict[str, int]]
+    _actor_ids: Optional[dict[str, int]]
+
+    def __init__(self, snapshot_file: str, expected_checksum: Optional[str] = None) -> None:
+        """Open the given snapshot file.
+
+        Raise a ValueError if the file is not a snapshot, was written with a different schema version, or
+        expected_checksum is given and does not match the checksum of the source data in the file.
+        """
+        with open(snapshot_file, 'rb') as f:
+            # mmap raises a ValueError itself for an empty file
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            header = self._read_header(snapshot_file)
+            self.schema_version = header['schema_version']
+            self.checksum = header['checksum']
+            self.sources = header['sources']
+            if self.schema_version != SCHEMA_VERSION:
+                raise ValueError(f'snapshot schema version {self.schema_version}, expected {SCHEMA_VERSION}')
+            if expected_checksum is not None and self.checksum != expected_checksum:
+                raise ValueError('snapshot was built from different source data')
+            self._sections = self._map_sections(snapshot_file, header['sections'])
+        except ValueError:
+            self._mmap.close()
+            raise
+        self.features = self._sections['features']
+        self.feature_names = self._strings('features.names')
+        self._movie_ids = None
+        self._actor_ids = None
+
+    def _read_header(self, snapshot_file: str) -> dict:
+        """Return the decoded JSON header of the mapped file. Raise a ValueError if the file does not start
+        with the magic bytes, is too short to hold its header, or the header is not a valid snapshot header.
+        """
+        start = len(MAGIC) + 4
+        if len(self._mmap) < start or self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{snapshot_file} is not a snapshot file')
+        (header_length,) = struct.unpack_from('<I', self._mmap, len(MAGIC))
+        if len(self._mmap) < start + header_length:
+            raise ValueError(f'{snapshot_file} is truncated: its header is incomplete')
+        try:
+            header = json.loads(self._mmap[start:start + header_length].decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as error:
+            raise ValueError(f'{snapshot_file} has a corrupt header') from error
+        if not isinstance(header, dict) or not {'schema_version', 'checksum', 'sources', 'sections'} <= header.keys():
+            raise ValueError(f'{snapshot_file} has a corrupt header')
+        return header
+
+    def _map_sections(self, snapshot_file: str, sections: dict) -> dict[str, np.ndarray]:
+        """Return an array view of the mapped file for every section described in the header. Raise a
+        ValueError if a section description is invalid, a section lies outside the file, or a section the
+        snapshot needs is missing.
+        """
+        # check every section before creating any view, since the file cannot be closed while views exist
+        layout = {}
+        for name, section in sections.items():
+            try:
+                dtype = np.dtype(section['dtype'])
+                shape = tuple(int(n) for n in section['shape'])
+                offset = int(section['offset'])
+            except (KeyError, TypeError, ValueError) as error:
+                raise ValueError(f'{snapshot_file} has a corrupt description of section {name}') from error
+            count = int(np.prod(shape))
+            if offset < 0 or min(shape, default=0) < 0 or offset + count * dtype.itemsize > len(self._mmap):
+                raise ValueError(f'{snapshot_file} is truncated: section {name} lies outside the file')
+            layout[name] = (dtype, shape, count, offset)
+
+        required = {'features', 'cast.offsets', 'cast.ids', 'filmography.offsets', 'filmography.ids'}
+        for table in ('titles', 'actors', 'features.names', 'movies.links', 'movies.durations', 'movies.ratings'):
+            required |= {table + '.bytes', table + '.offsets'}
+        if not required <= layout.keys():
+            raise ValueError(f'{snapshot_file} is missing sections {sorted(required - layout.keys())}')
+        return {name: np.frombuffer(self._mmap, dtype=dtype, count=count, offset=offset).reshape(shape)
+                for name, (dtype, shape, count, offset) in layout.items()}
+
+    def _string(self, table: str, i: int) -> str:
+        """Return string i of the given string table."""
+        offsets = self._sections[table + '.offsets']
+        return self._sections[table + '.bytes'][offsets[i]:offsets[i + 1]].tobytes().decode('utf-8')
+
+    def _strings(self, table: str) -> list[str]:
+        """Return every string of the given string table."""
+        data = self._sections[table + '.bytes'].tobytes()
+        offsets = self._sections[table + '.offsets']
+        return [data[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+
+    def num_movies(self) -> int:
+        """Return the number of movies in this snapshot."""
+        return len(self._sections['titles.offsets']) - 1
+
+    def num_actors(self) -> int:
+        """Return the number of actors in this snapshot."""
+        return len(self._sections['actors.offsets']) - 1
+
+    def title(self, movie_id: int) -> str:
+        """Return the title of the given movie id."""
+        return self._string('titles', movie_id)
+
+    def actor(self, actor_id: int) -> str:
+        """Return the name of the given actor id."""
+        return self._string('actors', actor_id)
+
+    def movie_id(self, title: str) -> int:
+        """Return the movie id of the given title. Raise a ValueError if it is not in this snapshot."""
+        if self._movie_ids is None:
+            self._movie_ids = {t: i for i, t in enumerate(self._strings('titles'))}
+        if title not in self._movie_ids:
+            raise ValueError
+        return self._movie_ids[title]
+
+    def actor_id(self, actor: str) -> int:
+        """Return the actor id of the given actor. Raise a ValueError if they are not in this snapshot."""
+        if self._actor_ids is None:
+            self._actor_ids = {a: i for i, a in enumerate(self._strings('actors'))}
+        if actor not in self._actor_ids:
+            raise ValueError
+        return self._actor_ids[actor]
+
+    def movies(self) -> list[Movie]:
+        """Return the decision tree Movie of every movie id, rebuilt from the snapshot's string tables."""
+        return [Movie(title, link, duration, rating) for title, link, duration, rating in
+                zip(self._strings('titles'), self._strings('movies.links'), self._strings('movies.durations'),
+                    self._strings('movies.ratings'))]
+
+    def cast(self, movie_id: int) -> np.ndarray:
+        """Return the actor ids of the cast of the given movie id, as a view into the snapshot."""
+        offsets = self._sections['cast.offsets']
+        return self._sections['cast.ids'][offsets[movie_id]:offsets[movie_id + 1]]
+
+    def filmography(self, actor_id: int) -> np.ndarray:
+        """Return the movie ids of the movies of the given actor id, as a view into the snapshot."""
+        offsets = self._sections['filmography.offsets']
+        return self._sections['filmography.ids'][offsets[actor_id]:offsets[actor_id + 1]]
+
+    def cast_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return the (offsets, actor ids) arrays of the movie to cast adjacency, as views into the snapshot."""
+        return self._sections['cast.offsets'], self._sections['cast.ids']
+
+    def filmography_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return the (offsets, movie ids) arrays of the actor to movie adjacency, as views into the snapshot."""
+        return self._sections['filmography.offsets'], self._sections['filmography.ids']
+
+    def get_neighbours(self, item: str, kind: Optional[str] = None, item_kind: Optional[str] = None) -> set[str]:
+        """Return the neighbours of the given movie title or actor, like Graph.get_neighbours. A snapshot only
+        holds the movie and actor vertices, so kind 'director' or 'genre' gives an empty set.
+
+        Raise a ValueError if item is neither a title nor an actor in this snapshot.
+        """
+        if item_kind != 'actor':
+            try:
+                movie_id = self.movie_id(item)
+                return {self.actor(i) for i in self.cast(movie_id)} if kind in (None, 'actor') else set()
+            except ValueError:
+                if item_kind == 'movie':
+                    raise
+        actor_id = self.actor_id(item)
+        return {self.title(i) for i in self.filmography(actor_id)} if kind in (None, 'movie') else set()
+
+    def has_vertex(self, item: str, kind: Optional[str] = None) -> bool:
+        """Return whether item is a title (kind 'movie') or an actor (kind 'actor') in this snapshot, or either
+        if kind is None, like Graph.has_vertex.
+        """
+        for vertex_kind, find in (('movie', self.movie_id), ('actor', self.actor_id)):
+            if kind in (None, vertex_kind):
+                try:
+                    find(item)
+                    return True
+                except ValueError:
+                    pass
+        return False
+
+    def get_vertices(self, kind: str) -> set[str]:
+        """Return a set of the titles (kind 'movie') or actors (kind 'actor') in this snapshot, like
+        Graph.get_vertices.
+        """
+        if kind == 'movie':
+            return set(self._strings('titles'))
+        elif kind == 'actor':
+            return set(self._strings('actors'))
+        return set()
+
+    def memory_report(self) -> dict[str, int]:
+        """Return a breakdown of the bytes used by this snapshot, as returned by memory.deep_size_report.
+        The sections are views into the memory map, so only their headers are counted: their pages belong to
+        the page cache and are shared with every other process that opens the same file.
+        """
+        return deep_size_report(self)
+
+    def to_graph(self) -> Graph:
+        """Return a new Graph with the movies, actors and edges of this snapshot."""
+        graph = Graph()
+        titles = self._strings('titles')
+        actors = self._strings('actors')
+        for title in titles:
+            graph.add_vertex(title, 'movie')
+        for actor in actors:
+            graph.add_vertex(actor, 'actor')
+        for movie_id, title in enumerate(titles):
+            for actor_id in self.cast(movie_id):
+                graph.add_edge(title, actors[actor_id], 'movie', 'actor')
+        return graph
+
+    def range_index(self) -> RangeIndex:
+        """Return a RangeIndex over the movie ids of this snapshot, whose sorted columns are views into the
+        snapshot rather than being sorted again.
+        """
+        index = RangeIndex(self._strings('titles'), {})
+        for name in COLUMNS:
+            values = self._sections[f'range.{name}.values']
+            order = self._sections[f'range.{name}.order']
+            index.add_sorted_column(name, values, order)
+        return index
+
+    def close(self) -> None:
+        """Release this snapshot's memory map.
+
+        If arrays returned by this snapshot are still referenced elsewhere, the map stays open until they are
+        garbage collected.
+        """
+        self._sections = {}
+        self.features = np.empty((0, 0), dtype=np.uint8)
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+
+def load_graph_within_budget(movie_file: str, decision_file: str, snapshot_file: str, memory_budget: Optional[int],
+                             mode: str = 'downgrade') -> Graph | EngineSnapshot:
+    """Return the movie-actor graph of movie_file, built with load_movie_actor_graph if its estimated size fits in
+    memory_budget bytes (or memory_budget is None). The estimate includes the movie basics the build loads first.
+
+    Otherwise, with mode 'downgrade', return the compact backend instead: the EngineSnapshot in snapshot_file,
+    which is written first if it is missing or was built from different source data. It supports get_vertices
+    and get_neighbours like a Graph. With mode 'refuse', raise a MemoryError.
+
+    Preconditions:
+        - mode in {'refuse', 'downgrade'}
+    """
+    estimate = estimate_graph_bytes(movie_file) + MovieData.estimate_movie_basics_bytes(movie_file)
+    if memory_budget is None or check_budget(estimate, memory_budget, mode):
+        return load_movie_actor_graph(movie_file)
+    try:
+        return open_snapshot(snapshot_file, movie_file, decision_file)
+    except (OSError, ValueError):
+        write_snapshot(movie_file, decision_file, snapshot_file)
+        return open_snapshot(snapshot_file)
+
+
+def open_snapshot(snapshot_file: str, movie_file: Optional[str] = None, decision_file: Optional[str] = None,
+                  verify: bool = False) -> EngineSnapshot:
+    """Open the given snapshot file. For each of movie_file and decision_file that is given, raise a ValueError
+    if its size or modification time differs from the source the snapshot was built from; this only reads the
+    files' metadata. If verify is True and both files are given, also raise a ValueError if their contents do
+    not match the snapshot's checksum.
+    """
+    expected = None
+    if verify and movie_file is not None and decision_file is not None:
+        expected = source_checksum(movie_file, decision_file)
+    snapshot = EngineSnapshot(snapshot_file, expected)
+    for kind, file in (('movie', movie_file), ('decision', decision_file)):
+        if file is not None and source_stats(file) != snapshot.sources[kind]:
+            snapshot.close()
+            raise ValueError(f'{file} has changed since the snapshot was written')
+    return snapshot
+
+
+if __name__ == '__main__':
+
+    import python_ta.contracts
+    import doctest
+
+    python_ta.contracts.check_all_contracts()
+
+    doctest.testmod(verbose='TRUE')
+
+    python_ta.check_all(config={
+        'extra-imports': ['__future__', 'csv', 'hashlib', 'json', 'mmap', 'os', 'pickle', 'struct', 'typing', 'numpy',
+                          'movie_actor_graph', 'movie_data', 'tree', 'range_index', 'memory'],
+        'allowed-io': ['source_checksum', 'read_cast', 'write_snapshot', 'EngineSnapshot.__init__'],
+        'max-line-length': 120
+    })
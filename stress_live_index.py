@@ -0,0 +1,111 @@
+"""
+Module Description
+==================
+This module is a stress test for IndexHandle. Many reader threads run actor and preference searches in a loop
+while the main thread repeatedly builds and publishes new MovieIndex versions. It checks that:
+- no reader ever sees a closed index while it holds it
+- each reader only ever sees the version number go up
+- searches give the same answers on every version (the data does not change between reloads)
+- once the readers stop, every replaced version has been released and none are left pending
+
+It prints a summary and exits with status 1 if any check fails.
+
+Run it with: python stress_live_index.py [readers] [reloads]
+
+Copyright and Usage Information
+===============================
+
+This file is solely for the personal and private use of
+Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited.
+
+This file is Copyright (c) 2025 Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from live_index import IndexHandle
+from recommender import build_movie_index, search_actor, recommend_movies
+
+MOVIE_FILE = 'imdb_top_1000.csv'
+QUERIES = [('Al Pacino', '120-180 minutes', ['Crime', 'Drama']),
+           ('Tom Hanks', '90-120 minutes', ['Comedy']),
+           ('Nobody At All', '90-120 minutes', ['Drama', 'Western', 'Horror'])]
+
+
+def reader_loop(handle: IndexHandle, expected: list, stop: threading.Event, errors: list[str],
+                counts: list[int], slot: int) -> None:
+    """Run searches against handle until stop is set, appending a message to errors for each failed check
+    and counting the searches in counts[slot].
+    """
+    last_version = -1
+    i = 0
+    while not stop.is_set():
+        actor, length, genres = QUERIES[i % len(QUERIES)]
+        with handle.reader() as index:
+            if index.closed:
+                errors.append(f'reader {slot} got closed version {index.version}')
+                return
+            if index.version < last_version:
+                errors.append(f'reader {slot} went from version {last_version} back to {index.version}')
+            last_version = index.version
+            movies = search_actor(index, actor)
+            recommended, exact = recommend_movies(index, length, genres)
+            result = (movies, sorted(m.title for m in recommended), exact)
+            if index.closed:
+                errors.append(f'version {index.version} was closed while reader {slot} held it')
+        if result != expected[i % len(QUERIES)]:
+            errors.append(f'reader {slot} got a different answer for query {i % len(QUERIES)}')
+        counts[slot] += 1
+        i += 1
+
+
+def main(readers: int = 8, reloads: int = 5) -> int:
+    """Run the stress test with the given number of reader threads and reloads. Return the exit status."""
+    decision_file = os.path.join(tempfile.mkdtemp(), 'decision_tree.csv')
+    handle = IndexHandle(build_movie_index(MOVIE_FILE, decision_file))
+    with handle.reader() as index:
+        expected = []
+        for actor, length, genres in QUERIES:
+            recommended, exact = recommend_movies(index, length, genres)
+            expected.append((search_actor(index, actor), sorted(m.title for m in recommended), exact))
+
+    stop = threading.Event()
+    errors = []
+    counts = [0] * readers
+    threads = [threading.Thread(target=reader_loop, args=(handle, expected, stop, errors, counts, slot))
+               for slot in range(readers)]
+    for thread in threads:
+        thread.start()
+
+    start = time.perf_counter()
+    for _ in range(reloads):
+        handle.reload(lambda version: build_movie_index(MOVIE_FILE, decision_file, version))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    if handle.pending():
+        errors.append(f'versions {handle.pending()} were never released')
+    if sorted(handle.released) != list(range(reloads)):
+        errors.append(f'released versions {sorted(handle.released)}, expected 0 to {reloads - 1}')
+
+    print(f'{readers} readers, {reloads} reloads in {elapsed:.2f} s, {sum(counts)} searches, '
+          f'current version {handle.current().version}, {len(handle.released)} versions released')
+    for error in errors[:20]:
+        print('FAIL:', error)
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2:
+        sys.exit(main(int(sys.argv[1]), int(sys.argv[2])))
+    elif len(sys.argv) > 1:
+        sys.exit(main(int(sys.argv[1])))
+    else:
+        sys.exit(main())
@@ -24,11 +24,12 @@ expressly prohibited.
 
 This file is Copyright (c) 2025 Victoria Cai, Isabella Zhong, Maya Dowman, Grace-Keyi Wang
 """
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 import pickle
 import pandas as pd
 import numpy as np
 from movie_data import MovieData
+from memory import deep_size_report
 
 
 class Movie:
@@ -146,16 +147,20 @@ class MovieDecisionTree:
         Instance attributes:
             - self._root: the root of the decision tree
             - self._subtrees: the subtrees of the tree 
+            - self.feature_order: the decision csv feature index split on at each level of the tree,
+              or None if the tree splits on the features in csv order
     """
     _root: Optional[Any]
     _subtrees: list[Any]
+    feature_order: Optional[list[int]]
 
-    def __init__(self, root: Optional[Any], subtrees: list[Any]) -> None:
+    def __init__(self, root: Optional[Any], subtrees: list[Any], feature_order: Optional[list[int]] = None) -> None:
         """
             initializes the moviedecisiontree instance attributes
         """
         self._root = root
         self._subtrees = subtrees
+        self.feature_order = feature_order
 
     def is_empty(self) -> bool:
         """
@@ -175,9 +180,38 @@ class MovieDecisionTree:
         """
         return self._subtrees
 
+    def permute_input(self, inputs: list) -> Optional[list]:
+        """
+            returns the given encoding (in decision csv order, as returned by convert_user_input) permuted to
+            the order this tree splits on; an empty encoding, or any encoding for a tree without a feature_order,
+            is returned as it is
+
+            returns None if the tree has a feature_order and the encoding is a partial one, since a partial
+            encoding in csv order has no matching path in a tree that splits in another order
+        """
+        if self.feature_order is None or not inputs:
+            return list(inputs)
+        if len(inputs) != len(self.feature_order):
+            return None
+        return [inputs[i] for i in self.feature_order]
+
     def traverse_tree(self, inputs: list) -> Any:
         """
-            traverses the tree with user_input, returns not found if the branch doesn't exist
+            traverses the tree with user_input (in decision csv order, permuted with permute_input), returns
+            not found if the branch doesn't exist
+
+            on a tree without a feature_order, a partial input returns the roots of the children of the branch
+            it matches; a tree with a feature_order returns not found for a partial input, since the input
+            has no path in it (use iter_movies to list the movies matching a partial selection)
+        """
+        permuted = self.permute_input(inputs)
+        if permuted is None:
+            return "Not Found"
+        return self._traverse(permuted)
+
+    def _traverse(self, inputs: list) -> Any:
+        """
+            traverses the tree with inputs already in the order the tree splits on
         """
         if self.is_empty():
             return []
@@ -189,9 +223,150 @@ class MovieDecisionTree:
         else:
             for subtree in self._subtrees:
                 if subtree.get_root() == str(inputs[0]):
-                    return subtree.traverse_tree(inputs[1:])
+                    return subtree._traverse(inputs[1:])
         return "Not Found"
 
+    def size(self) -> int:
+        """
+            returns the number of nodes in the tree, including the root and the movie leaves
+        """
+        if self.is_empty():
+            return 0
+        return 1 + sum(subtree.size() for subtree in self._subtrees)
+
+    def memory_report(self) -> dict[str, int]:
+        """
+            returns a breakdown of the bytes used by the tree (its nodes and the movies at its leaves),
+            as returned by memory.deep_size_report
+        """
+        return deep_size_report(self)
+
+    def traversal_depth(self, inputs: list) -> int:
+        """
+            returns how many levels traverse_tree descends for the given inputs before it matches or fails
+        """
+        depth = 0
+        tree = self
+        for value in self.permute_input(inputs) or []:
+            matched = [subtree for subtree in tree.get_subtrees() if subtree.get_root() == str(value)]
+            if not matched:
+                return depth
+            tree = matched[0]
+            depth += 1
+        return depth
+
+    def _wanted(self, selection: dict[int, int], depth: int, subtree: Any) -> bool:
+        """
+            returns whether the given child of a node at the given depth agrees with the selection; the children
+            at depth d are the values of decision csv feature feature_order[d] (or d, without a feature_order),
+            and the movie leaves below the last feature always agree
+        """
+        num_features = len(self.feature_order) if self.feature_order is not None else None
+        if (num_features is not None and depth >= num_features) or isinstance(subtree.get_root(), Movie):
+            return True
+        feature = self.feature_order[depth] if self.feature_order is not None else depth
+        return feature not in selection or subtree.get_root() == str(selection[feature])
+
+    def _leaves(self, selection: dict[int, int], path: list[int]) -> Iterator[tuple[Movie, list[int]]]:
+        """
+            yields (movie, path) for every movie leaf that agrees with the selection, in the order the movies
+            were added, starting from the leaf at the given path (the child index taken at each level from the
+            root); path is empty to start from the first leaf
+
+            the traversal keeps its own stack of [subtree, index of the child being visited] frames instead of
+            recursing, so it can stop after any leaf and resume from a path without visiting the earlier leaves;
+            at the levels that split on a selected feature only the matching child is visited
+        """
+        if self.is_empty():
+            return
+        stack = [[self, 0]]
+        for index in path:
+            subtrees = stack[-1][0].get_subtrees()
+            if not 0 <= index < len(subtrees) or not self._wanted(selection, len(stack) - 1, subtrees[index]):
+                raise ValueError('cursor does not match this tree')
+            stack[-1][1] = index
+            stack.append([subtrees[index], 0])
+
+        while stack:
+            tree, index = stack[-1]
+            subtrees = tree.get_subtrees()
+            if not subtrees:
+                stack.pop()
+                if isinstance(tree.get_root(), Movie):
+                    yield tree.get_root(), [frame[1] for frame in stack]
+                if stack:
+                    stack[-1][1] += 1
+                continue
+            while index < len(subtrees) and not self._wanted(selection, len(stack) - 1, subtrees[index]):
+                index += 1
+            stack[-1][1] = index
+            if index < len(subtrees):
+                stack.append([subtrees[index], 0])
+            else:
+                stack.pop()
+                if stack:
+                    stack[-1][1] += 1
+
+    def iter_movies(self, selection: dict[int, int], cursor: Optional[str] = None) -> Iterator[Movie]:
+        """
+            lazily yields every movie that agrees with the (possibly partial) selection, in a stable order,
+            starting from the given cursor (as returned by page) or from the first movie
+
+            the selection maps decision csv feature indexes (the positions in a convert_user_input encoding)
+            to the bit a movie must have for them, so it means the same thing whatever order the tree splits
+            on; an empty selection yields every movie
+        """
+        for movie, _ in self._leaves(selection, self._parse_cursor(selection, cursor)):
+            yield movie
+
+    def page(self, selection: dict[int, int], size: int,
+             cursor: Optional[str] = None) -> tuple[list[Movie], Optional[str]]:
+        """
+            returns the next size movies of iter_movies(selection, cursor), and an opaque cursor for the page
+            after them, or None if there are no more movies
+
+            resuming from a cursor only walks down the path to its leaf, not over the movies before it
+
+            >>> tree = MovieDecisionTree('', [], [1, 0])  # splits on feature 1 first, then feature 0
+            >>> rows = [('Up', [1, 0]), ('Heat', [0, 1]), ('Jaws', [1, 0]), ('Ran', [1, 1])]
+            >>> for title, bits in rows:
+            ...     tree.create_branch([str(bits[i]) for i in tree.feature_order] + [Movie(title, '', 0.0, 0.0)])
+            >>> movies, cursor = tree.page({0: 1}, 2)
+            >>> [movie.title for movie in movies]
+            ['Up', 'Jaws']
+            >>> movies, cursor = tree.page({0: 1}, 2, cursor)
+            >>> [movie.title for movie in movies], cursor
+            (['Ran'], None)
+            >>> [movie.title for movie in tree.iter_movies({1: 1})]
+            ['Heat', 'Ran']
+        """
+        leaves = self._leaves(selection, self._parse_cursor(selection, cursor))
+        movies = []
+        for movie, path in leaves:
+            if len(movies) == size:
+                return movies, self._selection_key(selection) + '/' + '.'.join(str(i) for i in path)
+            movies.append(movie)
+        return movies, None
+
+    @staticmethod
+    def _selection_key(selection: dict[int, int]) -> str:
+        """
+            returns a string that identifies the selection, stored in its cursors
+        """
+        return ','.join(f'{feature}={int(bit)}' for feature, bit in sorted(selection.items()))
+
+    def _parse_cursor(self, selection: dict[int, int], cursor: Optional[str]) -> list[int]:
+        """
+            returns the leaf path stored in the given cursor, or [] if cursor is None; raises a ValueError if
+            the cursor was not returned by page for the same selection
+        """
+        if cursor is None:
+            return []
+        key, _, path = cursor.rpartition('/')
+        if key != self._selection_key(selection) or not all(i.isdigit() for i in path.split('.')):
+            raise ValueError('cursor does not belong to this query')
+        return [int(i) for i in path.split('.')]
+
     def create_branch(self, lst: list) -> None:
         """
             Creates a branch for the tree
@@ -275,11 +450,167 @@ class MovieDecisionTree:
     #     return movies
 
 
+def encode_batch(vocabulary: dict[str, int], inputs: list[set[str]]) -> np.ndarray:
+    """
+        returns the binary encoding of every set of decision csv columns in inputs as one row of an N x F uint8
+        matrix, where vocabulary maps each of the F columns to its position; names not in vocabulary are ignored
+
+        >>> encode_batch({'genre_Drama': 0, 'genre_War': 1, 'runtime_bin_mid': 2}, [{'genre_War'}, {'genre_Drama',
+        ...     'runtime_bin_mid', 'genre_Support'}])
+        array([[0, 1, 0],
+               [1, 0, 1]], dtype=uint8)
+    """
+    columns = [[vocabulary[name] for name in names if name in vocabulary] for names in inputs]
+    rows = np.repeat(np.arange(len(inputs)), [len(cols) for cols in columns])
+    matrix = np.zeros((len(inputs), len(vocabulary)), dtype=np.uint8)
+    matrix[rows, np.array([col for cols in columns for col in cols], dtype=np.intp)] = 1
+    return matrix
+
+
+class MovieSignatureIndex:
+    """A packed array of the binary genre/runtime signature of every movie in the decision tree, used to find
+        the movies closest to a query when the tree has no exact match
+
+        Each signature is packed into one unsigned 64-bit integer (bit i is feature i of the decision csv),
+        so the distance from a query to every movie is one XOR and one popcount per movie.
+
+        Instance Attributes:
+            - self.movies: the movie of each signature, in decision csv order
+            - self.signatures: the packed signature of each movie
+            - self.num_features: the number of features (bits) in each signature
+            - self.columns: the one-hot matrix stored by column, as one bitset (8 movies per byte) per feature
+
+        Representation Invariants:
+            - len(self.movies) == len(self.signatures)
+            - 0 < self.num_features <= 64
+    """
+    movies: list[Movie]
+    signatures: np.ndarray
+    num_features: int
+    columns: np.ndarray
+
+    def __init__(self, movies: list[Movie], rows: list[list[int]]) -> None:
+        """
+            initializes the index from the movies and their binary rows (one 0/1 value per feature)
+        """
+        self.movies = movies
+        self.num_features = len(rows[0]) if rows else 0
+        self.signatures = np.array([self.pack(row) for row in rows], dtype=np.uint64)
+        matrix = np.array(rows, dtype=np.uint8).reshape(len(rows), self.num_features)
+        self.columns = np.packbits(matrix.T, axis=1)
+
+    def pack(self, encoded: list) -> int:
+        """
+            packs a binary list into an integer, with encoded[i] as bit i
+        """
+        packed = 0
+        for i, bit in enumerate(encoded):
+            if int(bit):
+                packed |= 1 << i
+        return packed
+
+    def pack_batch(self, matrix: np.ndarray) -> np.ndarray:
+        """
+            packs every row of an N x num_features binary matrix into an integer, like pack, all at once
+        """
+        shifts = np.arange(self.num_features, dtype=np.uint64)
+        return np.bitwise_or.reduce(matrix.astype(np.uint64) << shifts, axis=1, initial=0)
+
+    def match_batch(self, matrix: np.ndarray, exact: bool = True, chunk: int = 1024) -> list[np.ndarray]:
+        """
+            returns, for every row of an N x num_features binary query matrix, the ids (positions in
+            self.movies, ascending) of the movies matching it, with the same meaning of exact as facet_counts
+
+            queries are packed and deduplicated first, so each distinct query is matched once; exact queries
+            are looked up with a binary search in the sorted signatures, and the others are compared against
+            every signature, chunk queries at a time to bound the size of the comparison matrix
+        """
+        queries, inverse = np.unique(self.pack_batch(matrix), return_inverse=True)
+        if exact:
+            order = np.argsort(self.signatures, kind='stable')
+            ordered = self.signatures[order]
+            starts = np.searchsorted(ordered, queries, side='left')
+            ends = np.searchsorted(ordered, queries, side='right')
+            found = [np.sort(order[start:end]) for start, end in zip(starts, ends)]
+        else:
+            found = []
+            for first in range(0, len(queries), chunk):
+                block = queries[first:first + chunk, None]
+                rows, ids = np.nonzero(self.signatures[None, :] & block == block)
+                found.extend(np.split(ids, np.searchsorted(rows, np.arange(1, len(block)))))
+        return [found[i] for i in inverse.reshape(-1)]
+
+    def distances(self, encoded: list, weights: Optional[list[float]] = None) -> np.ndarray:
+        """
+            returns the distance from the encoded query to every signature: the Hamming distance, or the sum
+            of the weights of the differing bits if weights (one per feature) is given
+        """
+        diff = self.signatures ^ np.uint64(self.pack(encoded))
+        if weights is None:
+            return np.bitwise_count(diff).astype(np.float64)
+
+        # weighted distance: look up the weight of each byte of the XOR in a 256-entry table per byte
+        total = np.zeros(len(diff), dtype=np.float64)
+        byte_values = np.arange(256)
+        for byte in range((self.num_features + 7) // 8):
+            table = np.zeros(256, dtype=np.float64)
+            for bit in range(8):
+                feature = byte * 8 + bit
+                if feature < self.num_features:
+                    table += ((byte_values >> bit) & 1) * weights[feature]
+            total += table[((diff >> np.uint64(byte * 8)) & np.uint64(0xFF)).astype(np.intp)]
+        return total
+
+    def count(self, encoded: list, exact: bool = False) -> int:
+        """
+            returns how many movies match the encoded query, with the same meaning of exact as facet_counts
+        """
+        query = np.uint64(self.pack(encoded))
+        if exact:
+            return int(np.count_nonzero(self.signatures == query))
+        return int(np.count_nonzero(self.signatures & query == query))
+
+    def facet_counts(self, encoded: list, exact: bool = False) -> np.ndarray:
+        """
+            returns, for each feature, how many movies match the encoded query with that feature switched on
+
+            if exact is False, a movie matches when it has every feature of the query (AND of the column
+            bitsets of the query, then AND with each column and popcount, all features at once)
+            if exact is True, a movie matches when its signature is exactly the query, which is what
+            traverse_tree needs: a feature that is switched off counts the movies one bit away from the query
+            in that feature, and a feature that is already on counts the exact matches of the query itself
+        """
+        query = [i for i, bit in enumerate(encoded) if int(bit)]
+        if not exact:
+            base = np.bitwise_and.reduce(self.columns[query], axis=0) if query else \
+                np.full(self.columns.shape[1], 0xFF, dtype=np.uint8)
+            return np.bitwise_count(self.columns & base).sum(axis=1, dtype=np.int64)
+
+        diff = self.signatures ^ np.uint64(self.pack(encoded))
+        one_bit = diff[np.bitwise_count(diff) == 1]
+        counts = np.bincount(np.log2(one_bit.astype(np.float64)).astype(np.intp), minlength=self.num_features)
+        counts[query] = np.count_nonzero(diff == 0)
+        return counts[:self.num_features].astype(np.int64)
+
+    def nearest(self, encoded: list, k: int = 10, max_distance: float = 3,
+                weights: Optional[list[float]] = None) -> list[tuple[Movie, float]]:
+        """
+            returns up to k (movie, distance) pairs for the movies closest to the encoded query, ranked by
+            distance (ties in decision csv order), leaving out movies further than max_distance
+        """
+        if not self.movies or k <= 0:
+            return []
+        dist = self.distances(encoded, weights)
+        within = np.flatnonzero(dist <= max_distance)
+        order = within[np.argsort(dist[within], kind='stable')][:k]
+        return [(self.movies[i], float(dist[i])) for i in order]
+
+
 if __name__ == '__main__':
     import python_ta
 
     python_ta.check_all(config={
-        'extra-imports': ['movie_data', 'numpy', 'pandas', 'pickle'],  # the names (strs) of imported modules
+        'extra-imports': ['movie_data', 'memory', 'numpy', 'pandas', 'pickle'],  # the names (strs) of imported modules
         'allowed-io': [],     # the names (strs) of functions that call print/open/input
         'max-line-length': 120
     })